@@ -20,10 +20,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-# Init logger
-from loguru import logger
-
-logger.add("pmole.log", rotation="10 MB")
+# Logger, loguru is imported and the log file added only once needed
+from pmole.log import logger
 
 # Global constants and variables
 from pmole.globals import *
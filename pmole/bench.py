@@ -0,0 +1,289 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__all__ = [
+    "Bench",
+    "CORPORA",
+    "ENGINES",
+    "DEFAULT_SIZES"
+]
+
+import os
+import time
+import json
+import importlib
+
+from pathlib import Path
+
+from pmole.log import logger
+
+from pmole.lzw import LZW
+from pmole.lzw import LZWCodeTable
+from pmole.container import Container
+from pmole.metrics import Metrics
+
+# Generated corpora
+CORPUS_TEXT: str = "text"
+CORPUS_CODE: str = "code"
+CORPUS_JSON: str = "json"
+CORPUS_LOGS: str = "logs"
+CORPUS_RANDOM: str = "random"
+
+CORPORA: tuple[str] = (CORPUS_TEXT, CORPUS_CODE, CORPUS_JSON, CORPUS_LOGS, CORPUS_RANDOM)
+
+# Compressors, the stdlib ones are the reference baselines
+ENGINE_LZW: str = "lzw"
+ENGINE_PMOLE: str = "pmole"
+ENGINE_PMOLE_HUFFMAN: str = "pmole-huffman"  # With the Huffman entropy coding stage
+STDLIB_ENGINES: tuple[str] = ("zlib", "bz2", "lzma")
+
+ENGINES: tuple[str] = (ENGINE_LZW, ENGINE_PMOLE, ENGINE_PMOLE_HUFFMAN) + STDLIB_ENGINES
+
+DEFAULT_SIZES: tuple[int] = (64 << 10, 256 << 10, 1 << 20)
+
+# Corpora are generated from a fixed seed so every run compresses the same data
+SEED: int = 0x504D
+
+WORDS: tuple[str] = (
+    "the", "of", "and", "to", "a", "in", "is", "it", "that", "was", "he", "for",
+    "on", "are", "with", "as", "his", "they", "be", "at", "one", "have", "this",
+    "from", "or", "had", "by", "word", "but", "what", "some", "we", "can", "out",
+    "other", "were", "all", "there", "when", "up", "use", "your", "how", "said",
+    "each", "which", "she", "do", "their", "time", "if", "will", "way", "about",
+    "many", "then", "them", "write", "would", "like", "so", "these", "her", "long",
+    "make", "thing", "see", "him", "two", "has", "look", "more", "day", "could",
+    "come", "did", "number", "sound", "most", "people", "over", "know", "water",
+    "than", "call", "first", "who", "may", "down", "side", "been", "now", "find",
+    "window", "field", "house", "month", "world", "outside", "bird", "animal",
+)
+
+LOG_MESSAGES: tuple[str] = (
+    "GET /api/v1/users/{id} 200 {ms}ms",
+    "GET /api/v1/orders?page={id} 200 {ms}ms",
+    "POST /api/v1/orders 201 {ms}ms",
+    "cache miss for key user:{id}",
+    "connection pool exhausted, waiting {ms}ms",
+    "retrying request {id} after timeout",
+)
+LOG_LEVELS: tuple[str] = ("INFO", "INFO", "INFO", "DEBUG", "WARNING", "ERROR")
+
+# Stubs
+class Bench: ...
+
+# Implementations
+class Bench:
+    """
+    Benchmark of `LZW` and `Pmole` against the stdlib compressors on
+    generated corpora.
+
+    Every case runs in a fresh process so its peak RSS is its own.
+    """
+    def __init__(self) -> None:
+        pass
+
+    @staticmethod
+    def generate(corpus: str, size: int) -> bytes:
+        """
+        Generate `size` bytes of a corpus, always the same ones.
+        """
+        import random
+
+        rng = random.Random(f"{SEED}:{corpus}")
+
+        if corpus == CORPUS_RANDOM:
+            return rng.randbytes(size)
+
+        weights = [1 / (i + 1) for i in range(len(WORDS))]  # Zipf like
+        parts: list[str] = list()
+        length = 0
+
+        i = 0
+        while length < size:
+            if corpus == CORPUS_TEXT:
+                words = rng.choices(WORDS, weights=weights, k=rng.randint(6, 18))
+                part = " ".join(words).capitalize() + rng.choice((". ", ". ", "? ", ".\n"))
+            elif corpus == CORPUS_CODE:
+                name, arg = rng.sample(WORDS, 2)
+                part = (
+                    f"def {name}_{i}({arg}: int, count: int = {rng.randint(0, 99)}) -> int:\n"
+                    f"    \"\"\"\n    Return the {name} of the {arg}.\n    \"\"\"\n"
+                    f"    if {arg} < count:\n        return {arg} * {rng.randint(2, 9)}\n\n"
+                    f"    return {name}_{max(i - 1, 0)}({arg} - 1, count)\n\n"
+                )
+            elif corpus == CORPUS_JSON:
+                part = json.dumps({
+                    "id": i,
+                    "name": " ".join(rng.choices(WORDS, k=2)),
+                    "active": rng.random() < 0.5,
+                    "score": round(rng.random() * 100, 2),
+                    "tags": rng.sample(WORDS, 3),
+                }) + ",\n"
+            elif corpus == CORPUS_LOGS:
+                level = rng.choice(LOG_LEVELS)
+                message = rng.choice(LOG_MESSAGES).format(id=rng.randint(1, 5000), ms=rng.randint(1, 900))
+                part = f"2025-01-01T{i // 3600 % 24:02}:{i // 60 % 60:02}:{i % 60:02}.{rng.randint(0, 999):03}Z {level:<7} [worker-{rng.randint(1, 8)}] {message}\n"
+            else:
+                raise ValueError(f"Unknown corpus `{corpus}`.")
+
+            parts.append(part)
+            length += len(part)
+            i += 1
+
+        return "".join(parts).encode("utf-8")[:size]
+
+    @staticmethod
+    def run_case(engine: str, corpus: str, size: int, threads: int = 1) -> dict:
+        """
+        Compress and decompress a corpus with an engine, runs in its own
+        process.
+        """
+        data = Bench.generate(corpus, size)
+
+        if engine in STDLIB_ENGINES:
+            module = importlib.import_module(engine)
+
+            start = time.perf_counter_ns()
+            compressed_data = module.compress(data)
+            compress_time = time.perf_counter_ns() - start
+
+            start = time.perf_counter_ns()
+            decompressed_data = module.decompress(compressed_data)
+            decompress_time = time.perf_counter_ns() - start
+
+            compressed_size = len(compressed_data)
+        elif engine == ENGINE_LZW:
+            container = Container()
+
+            start = time.perf_counter_ns()
+            codes = LZW().compress(data, LZWCodeTable())
+            compressed_data = container.pack_codes(codes)
+            compress_time = time.perf_counter_ns() - start
+
+            start = time.perf_counter_ns()
+            codes = container.unpack_codes(compressed_data, len(codes))
+            decompressed_data = LZW().decompress(codes, LZWCodeTable())
+            decompress_time = time.perf_counter_ns() - start
+
+            compressed_size = len(compressed_data)
+        elif engine in (ENGINE_PMOLE, ENGINE_PMOLE_HUFFMAN):
+            import tempfile
+
+            from pmole.pmole import Pmole
+            from pmole.container import CODING_NONE
+            from pmole.container import CODING_HUFFMAN
+
+            coding = CODING_HUFFMAN if engine == ENGINE_PMOLE_HUFFMAN else CODING_NONE
+
+            cwd = os.getcwd()
+
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+
+                try:
+                    Path("corpus.bin").write_bytes(data)
+
+                    start = time.perf_counter_ns()
+                    Pmole().compress(file_path="corpus.bin", threads=threads, coding=coding)
+                    compress_time = time.perf_counter_ns() - start
+
+                    Path("corpus.bin").unlink()
+
+                    start = time.perf_counter_ns()
+                    Pmole().decompress(file_path="corpus.pm", threads=threads)
+                    decompress_time = time.perf_counter_ns() - start
+
+                    compressed_size = Path("corpus.pm").stat().st_size
+                    decompressed_data = Path("corpus.bin").read_bytes()
+                finally:
+                    os.chdir(cwd)
+        else:
+            raise ValueError(f"Unknown engine `{engine}`.")
+
+        if decompressed_data != data:
+            raise ValueError(f"`{engine}` didn't round trip the `{corpus}` corpus.")
+
+        peak_memory = Metrics.peak_memory()
+
+        return {
+            "engine": engine,
+            "corpus": corpus,
+            "size": size,
+            "compressed_size": compressed_size,
+            "ratio": size / compressed_size if compressed_size else None,
+            "compress_ns": compress_time,
+            "decompress_ns": decompress_time,
+            "compress_mb_s": size / 1e6 / (compress_time / 1e9) if compress_time else None,
+            "decompress_mb_s": size / 1e6 / (decompress_time / 1e9) if decompress_time else None,
+            "peak_rss_bytes": max(peak_memory.values()) if peak_memory is not None else None,
+        }
+
+    def run(
+        self,
+        corpora: tuple[str] = CORPORA,
+        sizes: tuple[int] = DEFAULT_SIZES,
+        engines: tuple[str] = ENGINES,
+        threads: int = 1
+    ) -> dict:
+        """
+        Run every engine on every corpus at every size.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+        results: list[dict] = list()
+
+        for corpus in corpora:
+            for size in sizes:
+                for engine in engines:
+                    # A fresh process per case, peak RSS never goes down
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                        result = executor.submit(Bench.run_case, engine, corpus, size, threads).result()
+
+                    logger.info(
+                        f"{engine:>13} {corpus:>6} {size:>9} bytes: ratio {result['ratio']:.3f}, "
+                        f"compress {result['compress_mb_s']:.2f} MB/s, "
+                        f"decompress {result['decompress_mb_s']:.2f} MB/s"
+                    )
+
+                    results.append(result)
+
+        import platform
+
+        return {
+            "pmole_version": self.version(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "threads": threads,
+            "results": results,
+        }
+
+    @staticmethod
+    def version() -> str | None:
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            return version("pmole")
+        except PackageNotFoundError:
+            return None
@@ -25,41 +25,154 @@ __all__ = [
 ]
 
 import os
+import json
+import time
 
 import typer
 
-from loguru import logger
+from pmole.log import logger
+from pmole.log import setup_logger
 from pathlib import Path
 
-from .pmole import Pmole
+# Only what the options need is imported here, the commands import
+# the rest so `pmole --help` starts fast.
+from pmole.container import (
+    FORMAT_BINARY,
+    FORMAT_TEXT,
+    CODING_NONE,
+    CODING_HUFFMAN,
+)
+from pmole.metrics import METRICS
+from pmole.bench import (
+    CORPORA,
+    ENGINES,
+    DEFAULT_SIZES,
+)
+from pmole.lzw import (
+    RESET,
+    FREEZE,
+    MIN_CODE_WIDTH,
+    MAX_CODE_WIDTH,
+    DEFAULT_MAX_CODE_WIDTH,
+    DEFAULT_TRAINED_ENTRIES,
+    DEFAULT_SAMPLE_SIZE,
+    LZWTrainedDictionary,
+)
 
 # Globals
 from pmole.globals import (
     CACHE_DIR,
-    DICTIONARY_CACHE_FILE_PATH,
-    REVERSE_DICTIONARY_CACHE_FILE_PATH,
 )
 
 cli = typer.Typer()
 
+TABLE_POLICIES: dict[str, int] = {
+    "reset": RESET,
+    "freeze": FREEZE,
+}
+
+ENTROPY_CODINGS: dict[str, int] = {
+    "none": CODING_NONE,
+    "huffman": CODING_HUFFMAN,
+}
+
+STATS_FORMATS: tuple[str] = ("json", )
+
+def check_stats_format(stats: str | None) -> None:
+    """
+    Exit if `--stats` was given an unknown format.
+    """
+    if stats is not None and stats not in STATS_FORMATS:
+        logger.error(f"Unknown stats format '{stats}'.")
+        exit(1)
+
+def print_stats(start: int) -> None:
+    """
+    Print the metrics of the run started at `start` (ns) as JSON.
+    """
+    counters = METRICS.snapshot()["counters"]
+
+    report = METRICS.report(
+        elapsed=time.perf_counter_ns() - start,
+        input_bytes=counters.get("bytes_read", 0),
+        output_bytes=counters.get("bytes_written", 0)
+    )
+
+    print(json.dumps(report, indent=4))
+
+def find_dictionary(name: str | None) -> str | None:
+    """
+    Get the path of the `--dict` trained dictionary, exit if there's none.
+    """
+    if name is None:
+        return None
+
+    path = LZWTrainedDictionary.find(name)
+
+    if not Path(path).is_file():
+        logger.error(f"No trained dictionary '{name}', train one with `pmole train`.")
+        exit(1)
+
+    return path
+
 def setup_cli_dir() -> None:
     """
     Create directories needed for the cli.
     """
     os.makedirs(CACHE_DIR, exist_ok=True)
-    
-    Path(DICTIONARY_CACHE_FILE_PATH).touch()
-    Path(REVERSE_DICTIONARY_CACHE_FILE_PATH).touch()
+
+def setup() -> None:
+    """
+    Create the directories and the log file of the cli, every command
+    starts with it. The callback runs even for a command's `--help`, the
+    body of the command doesn't.
+    """
+    setup_cli_dir()
+    setup_logger()
+
+@cli.callback()
+def main() -> None:
+    """
+    Compress files and directories into .pm archives
+    """
 
 @cli.command()
 def compress(
     file_path: str = typer.Option(None, "--file-path", help="The file path."),
     directory_path: str = typer.Option(None, "--dir-path", help="The directory path."),
     threads: int = typer.Option(7, "--threads", help="The number of threads."),
+    archive_format: str = typer.Option(
+        FORMAT_BINARY, "--format", help=f"The output format (`{FORMAT_BINARY}` or `{FORMAT_TEXT}`)."
+    ),
+    max_code_width: int = typer.Option(
+        DEFAULT_MAX_CODE_WIDTH,
+        "--max-code-width",
+        min=MIN_CODE_WIDTH,
+        max=MAX_CODE_WIDTH,
+        help="The max code width in bits, caps the dictionary size.",
+    ),
+    policy: str = typer.Option(
+        "reset", "--policy", help="What to do when the dictionary is full (`reset` or `freeze`)."
+    ),
+    block_size: int = typer.Option(
+        0,
+        "--block-size",
+        min=0,
+        help="Split files into independent blocks of this many bytes compressed in parallel (0 to disable).",
+    ),
+    dictionary: str = typer.Option(
+        None, "--dict", help="A trained dictionary (name or path) to start every file from."
+    ),
+    entropy: str = typer.Option(
+        "none", "--entropy", help="Entropy code the LZW codes (`none` or `huffman`), smaller but slower."
+    ),
+    stats: str = typer.Option(None, "--stats", help="Print the metrics of the run (`json`)."),
 ):
     """
     Compress a file
     """
+    setup()
+
     path = file_path if file_path is not None else directory_path
 
     logger.info(
@@ -74,9 +187,58 @@ def compress(
         logger.error(f"Symlinks are not supported.")
         exit(1)
 
+    if archive_format not in (FORMAT_BINARY, FORMAT_TEXT):
+        logger.error(f"Unknown output format '{archive_format}'.")
+        exit(1)
+
+    if policy not in TABLE_POLICIES:
+        logger.error(f"Unknown dictionary policy '{policy}'.")
+        exit(1)
+
+    if archive_format == FORMAT_TEXT and TABLE_POLICIES[policy] == FREEZE:
+        logger.error(f"The `{FORMAT_TEXT}` format only supports the `reset` policy.")
+        exit(1)
+
+    if archive_format == FORMAT_TEXT and dictionary is not None:
+        logger.error(f"The `{FORMAT_TEXT}` format doesn't support trained dictionaries.")
+        exit(1)
+
+    if entropy not in ENTROPY_CODINGS:
+        logger.error(f"Unknown entropy coding '{entropy}'.")
+        exit(1)
+
+    if archive_format == FORMAT_TEXT and ENTROPY_CODINGS[entropy] != CODING_NONE:
+        logger.error(f"The `{FORMAT_TEXT}` format doesn't support entropy coding.")
+        exit(1)
+
+    dictionary_path = find_dictionary(dictionary)
+
+    check_stats_format(stats)
+
+    start = time.perf_counter_ns()
+
+    from pmole.pmole import Pmole
+
     pmole = Pmole()
 
-    pmole.compress(file_path=file_path, directory_path=directory_path, threads=threads)
+    try:
+        pmole.compress(
+            file_path=file_path,
+            directory_path=directory_path,
+            threads=threads,
+            archive_format=archive_format,
+            max_code_width=max_code_width,
+            policy=TABLE_POLICIES[policy],
+            block_size=block_size,
+            dictionary_path=dictionary_path,
+            coding=ENTROPY_CODINGS[entropy]
+        )
+    except ValueError as error:
+        logger.error(error.args[0])
+        exit(1)
+
+    if stats is not None:
+        print_stats(start)
 
 @cli.command()
 def decompress(
@@ -84,22 +246,179 @@ def decompress(
         None, "--pm-file-path", help="The compressed file path (.pm)."
     ),
     threads: int = typer.Option(7, "--threads", help="The number of threads."),
+    dictionary: str = typer.Option(
+        None, "--dict", help="The trained dictionary (name or path) the archive was compressed with."
+    ),
+    stats: str = typer.Option(None, "--stats", help="Print the metrics of the run (`json`)."),
 ):
     """
     Decompress a file
     """
+    setup()
+
     if not Path(pm_file_path).exists():
         logger.error(f"The provided path '{pm_file_path}' doesn't exists.")
         exit(1)
 
+    check_stats_format(stats)
+
+    dictionary_path = find_dictionary(dictionary)
+
     logger.info(f"Decompressing `{pm_file_path}`...")
 
+    start = time.perf_counter_ns()
+
+    from pmole.pmole import Pmole
+
     pmole = Pmole()
 
-    pmole.decompress(file_path=pm_file_path, threads=threads)
+    try:
+        pmole.decompress(file_path=pm_file_path, threads=threads, dictionary_path=dictionary_path)
+    except ValueError as error:
+        logger.error(error.args[0])
+        exit(1)
+
+    # The archive isn't read through `FileHandler`
+    METRICS.count("bytes_read", Path(pm_file_path).stat().st_size)
 
     logger.info(f"Decompressing is complete.")
 
+    if stats is not None:
+        print_stats(start)
+
+@cli.command()
+def extract(
+    pm_file_path: str = typer.Option(
+        None, "--pm-file-path", help="The compressed file path (.pm)."
+    ),
+    member: str = typer.Option(
+        None, "--member", help="The path of the file to extract, as stored in the archive."
+    ),
+    threads: int = typer.Option(7, "--threads", help="The number of threads."),
+    dictionary: str = typer.Option(
+        None, "--dict", help="The trained dictionary (name or path) the archive was compressed with."
+    ),
+):
+    """
+    Extract a single file
+    """
+    setup()
+
+    if not Path(pm_file_path).exists():
+        logger.error(f"The provided path '{pm_file_path}' doesn't exists.")
+        exit(1)
+
+    dictionary_path = find_dictionary(dictionary)
+
+    logger.info(f"Extracting `{member}` from `{pm_file_path}`...")
+
+    from pmole.pmole import Pmole
+
+    pmole = Pmole()
+
+    try:
+        pmole.extract(
+            file_path=pm_file_path, member_path=member, threads=threads, dictionary_path=dictionary_path
+        )
+    except (KeyError, ValueError) as error:
+        logger.error(error.args[0])
+        exit(1)
+
+    logger.info(f"Extracting is complete.")
+
+@cli.command()
+def train(
+    directory_path: str = typer.Option(None, "--dir-path", help="The directory to sample."),
+    name: str = typer.Option(None, "--name", help="The dictionary name, the directory name by default."),
+    entries: int = typer.Option(
+        DEFAULT_TRAINED_ENTRIES, "--entries", min=1, help="The number of sequences to keep."
+    ),
+    sample_size: int = typer.Option(
+        DEFAULT_SAMPLE_SIZE, "--sample-size", min=1, help="How many bytes of the files to sample."
+    ),
+):
+    """
+    Train a dictionary for directories of many small similar files
+    """
+    setup()
+
+    if directory_path is None or not Path(directory_path).is_dir():
+        logger.error(f"The provided directory '{directory_path}' doesn't exists.")
+        exit(1)
+
+    from pmole.utils import list_files_in_directory
+
+    files_paths = sorted(list_files_in_directory(directory=directory_path))
+    if not files_paths:
+        logger.error(f"No files to sample in '{directory_path}'.")
+        exit(1)
+
+    if name is None:
+        name = Path(directory_path).resolve().name
+
+    try:
+        dictionary = LZWTrainedDictionary.train(files_paths, entries=entries, sample_size=sample_size)
+    except ValueError as error:
+        logger.error(error.args[0])
+        exit(1)
+
+    path = LZWTrainedDictionary.path(name)
+    dictionary.save(path)
+
+    logger.info(
+        f"Trained dictionary `{name}` ({dictionary.id:08x}) of {len(dictionary)} sequences saved to `{path}`, "
+        f"use it with `--dict {name}`."
+    )
+
+@cli.command()
+def bench(
+    corpora: str = typer.Option(
+        ",".join(CORPORA), "--corpora", help=f"Comma separated corpora ({', '.join(CORPORA)})."
+    ),
+    sizes: str = typer.Option(
+        ",".join(str(size) for size in DEFAULT_SIZES), "--sizes", help="Comma separated corpus sizes in bytes."
+    ),
+    engines: str = typer.Option(
+        ",".join(ENGINES), "--engines", help=f"Comma separated compressors ({', '.join(ENGINES)})."
+    ),
+    threads: int = typer.Option(1, "--threads", help="The number of threads pmole uses."),
+    output: str = typer.Option("pmole-bench.json", "--output", help="Where to write the JSON report."),
+):
+    """
+    Benchmark pmole against zlib, bz2 and lzma
+    """
+    setup()
+
+    corpora = tuple(corpus.strip() for corpus in corpora.split(",") if corpus.strip())
+    engines = tuple(engine.strip() for engine in engines.split(",") if engine.strip())
+
+    for corpus in corpora:
+        if corpus not in CORPORA:
+            logger.error(f"Unknown corpus '{corpus}'.")
+            exit(1)
+
+    for engine in engines:
+        if engine not in ENGINES:
+            logger.error(f"Unknown engine '{engine}'.")
+            exit(1)
+
+    try:
+        sizes = tuple(int(size) for size in sizes.split(",") if size.strip())
+    except ValueError:
+        logger.error(f"Invalid sizes '{sizes}'.")
+        exit(1)
+
+    if not sizes or min(sizes) <= 0:
+        logger.error(f"Sizes must be positive.")
+        exit(1)
+
+    from pmole.bench import Bench
+
+    report = Bench().run(corpora=corpora, sizes=sizes, engines=engines, threads=threads)
+
+    Path(output).write_text(json.dumps(report, indent=4))
+
+    logger.info(f"Benchmark report written to `{output}`.")
+
 def run() -> None:
-    setup_cli_dir()
     cli()
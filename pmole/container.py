@@ -0,0 +1,951 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__all__ = [
+    "Container",
+    "Member",
+    "IndexEntry",
+    "PM_MAGIC",
+    "PM_VERSION",
+    "FORMAT_BINARY",
+    "FORMAT_TEXT"
+]
+
+import io
+import os
+import mmap
+import time
+import struct
+
+from array import array
+
+from typing import BinaryIO, Generator
+
+from pmole.lzw import LZWCodeTable
+from pmole.lzw import RESET
+from pmole.lzw import DEFAULT_MAX_CODE_WIDTH
+from pmole.lzw import CODES_TYPECODE
+
+from pmole.huffman import LZWHuffman
+
+from pmole.metrics import METRICS
+from pmole.metrics import STAGE_SERIALIZE
+from pmole.metrics import STAGE_PARSE
+
+from pmole.file_handler import FileHandler
+
+from pmole.utils import split_data_to_blocks
+
+# File header
+PM_MAGIC: bytes = b"PMOLE"
+PM_VERSION: int = 8  # Bumped on every change of the layout
+PM_MIN_VERSION: int = 4  # Oldest version that can still be read, v4 has no links
+
+# Index trailer
+PM_INDEX_MAGIC: bytes = b"PMIDX"
+
+# Text format markers
+TEXT_PATH: bytes = b"::"
+TEXT_CODES: bytes = b"--"
+TEXT_EOF: bytes = b"[EOF]"
+TEXT_LEGACY_INDEX: bytes = b"idx"  # Skipped, written by early versions
+TEXT_HEADER: bytes = b"# pmole text\n"  # First line of byte alphabet files, legacy files have none
+
+# Output formats
+FORMAT_BINARY: str = "binary"
+FORMAT_TEXT: str = "text"  # Legacy `::`, `--` and `[EOF]` text format
+
+# Payload reading
+READ_SIZE: int = 1 << 16
+CODES_BATCH_SIZE: int = 1 << 16
+
+# Bit packing goes through an integer bit buffer, whole bytes are taken
+# out of it past this many bits and it is refilled this many bytes at a time
+PACK_FLUSH_BITS: int = 256
+UNPACK_REFILL_SIZE: int = 64
+
+# Bytes of a text member parsed at a time, a code takes 2 bytes at least
+# so a slice never holds more than `CODES_BATCH_SIZE` codes
+TEXT_SLICE_SIZE: int = 2 * CODES_BATCH_SIZE
+
+# Record types
+RECORD_END: int = 0
+RECORD_MEMBER: int = 1
+RECORD_LINK: int = 2  # A member sharing the data of an earlier identical one
+
+# Codes count of a block stored as is, its payload is the raw data (since v7)
+BLOCK_STORED: int = (1 << 64) - 1
+
+# Entropy coding of the codes of a member (since v8)
+CODING_NONE: int = 0  # Bit-packed codes
+CODING_HUFFMAN: int = 1  # Canonical Huffman coded codes, see `LZWHuffman`
+
+# Stubs
+class Member: ...
+class IndexEntry: ...
+class Container: ...
+
+# Implementations
+class Member:
+    """
+    A member (file) of a `.pm` container.
+
+    The data of a member is split into blocks of `block_size` bytes (a
+    single block when `block_size` is 0), each block is an independent
+    LZW stream and `blocks` holds the `(codes count, payload size)` of each.
+    Every block boundary is a checkpoint that decoding can start from.
+    Blocks LZW doesn't make smaller are stored as is, their codes count
+    is `BLOCK_STORED` and their payload is the raw data.
+    With a trained dictionary the code table of every block is pre-seeded
+    and learning starts at `start_code`. With a `coding` other than
+    `CODING_NONE` the codes of each block are entropy coded if it makes
+    them smaller.
+
+    A link is a member whose data is stored once for an earlier identical
+    member, `link` is the offset of that member's record and the payload
+    fields point at its payload.
+    """
+    def __init__(
+            self,
+            path: str,
+            max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+            policy: int = RESET,
+            uncompressed_size: int = 0,
+            block_size: int = 0,
+            blocks: list[tuple[int, int]] | None = None,
+            start_code: int = LZWCodeTable.FIRST_CODE,
+            coding: int = CODING_NONE
+    ) -> None:
+        self.path = path
+        self.max_code_width = max_code_width
+        self.policy = policy
+        self.uncompressed_size = uncompressed_size
+        self.block_size = block_size
+        self.blocks = blocks if blocks is not None else list()
+        self.start_code = start_code
+        self.coding = coding
+
+        self.codes_n = sum(codes_n for codes_n, _ in self.blocks if codes_n != BLOCK_STORED)
+        self.payload_size = sum(payload_size for _, payload_size in self.blocks)
+
+        # Where the record and the payload start in the container, and
+        # where the record ends (after the payload unless it's a link)
+        self.offset: int = 0
+        self.payload_offset: int = 0
+        self.end_offset: int = 0
+
+        # Record offset of the member holding the data of a link
+        self.link: int | None = None
+
+        # CRC32 of the uncompressed data, only known through the index
+        self.checksum: int | None = None
+
+    def checkpoint(self, offset: int) -> tuple[int, int, int]:
+        """
+        Find the block holding the uncompressed `offset`, blocks are the
+        points a decoder can restart from. Returns the index of the block,
+        its uncompressed offset and the offset of its payload in the
+        container.
+        """
+        if self.block_size <= 0 or len(self.blocks) <= 1:
+            return (0, 0, self.payload_offset)
+
+        index = min(offset // self.block_size, len(self.blocks) - 1)
+        payload_offset = self.payload_offset + sum(
+            payload_size for _, payload_size in self.blocks[:index]
+        )
+
+        return (index, index * self.block_size, payload_offset)
+
+    def linked(self, path: str) -> Member:
+        """
+        A link at `path` to the data of this member.
+        """
+        member = Member(
+            path=path,
+            max_code_width=self.max_code_width,
+            policy=self.policy,
+            uncompressed_size=self.uncompressed_size,
+            block_size=self.block_size,
+            blocks=self.blocks,
+            start_code=self.start_code,
+            coding=self.coding
+        )
+        member.link = self.offset
+        member.payload_offset = self.payload_offset
+        member.checksum = self.checksum
+
+        return member
+
+class IndexEntry:
+    """
+    An entry of the index of a `.pm` container.
+    """
+    def __init__(
+            self,
+            path: str,
+            offset: int,
+            compressed_size: int,
+            uncompressed_size: int,
+            checksum: int
+    ) -> None:
+        self.path = path
+        self.offset = offset
+        self.compressed_size = compressed_size
+        self.uncompressed_size = uncompressed_size
+        self.checksum = checksum
+
+class Container:
+    """
+    Binary `.pm` container (v8).
+
+    The container's layout looks like this:
+        >>> PM_MAGIC | version (u8)
+                | dictionary id (u32) | dictionary entries (u32)   <- 0 without a trained dictionary
+            RECORD_MEMBER (u8) | path length (u16) | path (utf-8)
+                | max code width (u8) | table policy (u8)
+                | uncompressed size (u64) | block size (u64) | blocks count (u32)
+                | entropy coding (u8)
+                | codes count (u64) | payload size (u64)    <- once per block
+                | payload (bit-packed codes or raw data of every block)
+            RECORD_LINK (u8) | path length (u16) | path (utf-8)
+                | record offset (u64)                           <- of the member holding the data
+            ...
+            RECORD_END (u8)
+            path length (u16) | path (utf-8)                            <- index, once per member
+                | record offset (u64) | payload size (u64)
+                | uncompressed size (u64) | checksum (crc32)
+            index offset (u64) | entries count (u32) | PM_INDEX_MAGIC    <- always the last bytes
+
+    The index is optional, readers that stop at `RECORD_END` never see it.
+    Links always point back to a member written before them, their index
+    entries have a payload size of 0.
+
+    Codes are packed big-endian with a width that grows with the code
+    table (see `LZWCodeTable.code_width`) up to the member's max code width.
+    The payload of a stored block (`BLOCK_STORED` codes) is its raw data.
+    In an entropy coded member the payload of every other block starts
+    with the coding its codes ended up with (u8), `CODING_NONE` when
+    entropy coding didn't make them smaller.
+    """
+    HEADER: struct.Struct = struct.Struct("<5sB")
+    DICTIONARY: struct.Struct = struct.Struct("<II")  # Since v6
+    RECORD: struct.Struct = struct.Struct("<B")
+    PATH: struct.Struct = struct.Struct("<H")
+    MEMBER: struct.Struct = struct.Struct("<BBQQI")
+    CODING: struct.Struct = struct.Struct("<B")  # Since v8
+    BLOCK: struct.Struct = struct.Struct("<QQ")
+    LINK: struct.Struct = struct.Struct("<Q")
+    INDEX_ENTRY: struct.Struct = struct.Struct("<QQQI")
+    INDEX_TRAILER: struct.Struct = struct.Struct("<QI5s")
+
+    def __init__(self) -> None:
+        pass
+
+    @staticmethod
+    def is_container(data: bytes) -> bool:
+        """
+        Does the data start with a container header.
+        """
+        return data[:len(PM_MAGIC)] == PM_MAGIC
+
+    @staticmethod
+    def is_text_archive(data: bytes) -> bool:
+        """
+        Does the data start with a text header, text files without one
+        are legacy ones whose codes come from the unicode alphabet.
+        """
+        return data[:len(TEXT_HEADER)] == TEXT_HEADER
+
+    @METRICS.timed(STAGE_SERIALIZE)
+    def pack_codes(
+        self,
+        codes: array | list[int],
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        start_code: int = LZWCodeTable.FIRST_CODE
+    ) -> bytes:
+        """
+        Pack codes into variable width bits.
+
+        The codes go into an integer bit buffer, flushed to whole bytes
+        every `PACK_FLUSH_BITS` bits or so to keep the shifts cheap.
+        """
+        output = bytearray()
+        buffer = 0
+        bits_n = 0
+
+        index = 0
+        width = LZWCodeTable.code_width(index, max_code_width, start_code)
+        grow_index = (1 << width) - start_code + 1
+
+        for code in codes:
+            if index == grow_index and width < max_code_width:
+                width += 1
+                grow_index = (1 << width) - start_code + 1
+
+            buffer = (buffer << width) | code
+            bits_n += width
+
+            # The width schedule starts over after a CLEAR code
+            if code == LZWCodeTable.CLEAR_CODE:
+                index = 0
+                width = LZWCodeTable.code_width(index, max_code_width, start_code)
+                grow_index = (1 << width) - start_code + 1
+            else:
+                index += 1
+
+            if bits_n >= PACK_FLUSH_BITS:
+                left_n = bits_n & 7
+
+                output += (buffer >> left_n).to_bytes(bits_n >> 3, "big")
+                buffer &= (1 << left_n) - 1
+                bits_n = left_n
+
+        if bits_n:
+            output += (buffer << (-bits_n & 7)).to_bytes((bits_n + 7) >> 3, "big")
+
+        return bytes(output)
+
+    @staticmethod
+    def packed_size(
+        codes: array | list[int],
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        start_code: int = LZWCodeTable.FIRST_CODE
+    ) -> int:
+        """
+        Size in bytes of codes packed with `pack_codes`, without packing them.
+        """
+        bits = 0
+
+        index = 0
+        for code in codes:
+            bits += LZWCodeTable.code_width(index, max_code_width, start_code)
+
+            index = 0 if code == LZWCodeTable.CLEAR_CODE else index + 1
+
+        return (bits + 7) // 8
+
+    def pack_block(
+        self,
+        codes: array | list[int],
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        start_code: int = LZWCodeTable.FIRST_CODE,
+        coding: int = CODING_NONE
+    ) -> bytes:
+        """
+        Pack the codes of a block of a member with the entropy `coding`,
+        which falls back to bit-packed codes when they are smaller.
+        """
+        payload = self.pack_codes(codes, max_code_width, start_code)
+
+        if coding == CODING_NONE:
+            return payload
+
+        if coding != CODING_HUFFMAN:
+            raise ValueError(f"Unknown entropy coding `{coding}`.")
+
+        coded_payload = LZWHuffman(max_code_width, start_code).encode(codes)
+
+        if len(coded_payload) < len(payload):
+            return self.CODING.pack(CODING_HUFFMAN) + coded_payload
+
+        return self.CODING.pack(CODING_NONE) + payload
+
+    def unpack_block(
+        self,
+        payload: bytes,
+        codes_n: int,
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        start_code: int = LZWCodeTable.FIRST_CODE,
+        coding: int = CODING_NONE
+    ) -> array:
+        """
+        Unpack the codes of a block packed with `pack_block`.
+        """
+        if coding == CODING_NONE:
+            return self.unpack_codes(payload, codes_n, max_code_width, start_code)
+
+        if not payload:
+            raise ValueError("Truncated entropy coded block.")
+
+        (block_coding, ) = self.CODING.unpack_from(payload)
+
+        if block_coding == CODING_NONE:
+            return self.unpack_codes(payload[self.CODING.size:], codes_n, max_code_width, start_code)
+
+        if block_coding != CODING_HUFFMAN:
+            raise ValueError(f"Unknown entropy coding `{block_coding}`.")
+
+        return LZWHuffman(max_code_width, start_code).decode(payload[self.CODING.size:], codes_n)
+
+    def unpack_codes(
+        self,
+        payload: bytes,
+        codes_n: int,
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        start_code: int = LZWCodeTable.FIRST_CODE
+    ) -> array:
+        """
+        Unpack `codes_n` variable width codes.
+        """
+        codes = array(CODES_TYPECODE)
+        for batch in self.iter_block_codes(
+            io.BytesIO(payload), codes_n, len(payload), max_code_width, start_code=start_code
+        ):
+            codes += batch
+
+        return codes
+
+    def iter_codes(
+        self, f: BinaryIO, member: Member, batch_size: int = CODES_BATCH_SIZE
+    ) -> Generator[array, None, None]:
+        """
+        Read a member's payload from `f` and unpack its codes in batches.
+
+        Blocks are separated by a CLEAR code, which makes the decoder
+        start over from the base alphabet just like a new block does.
+        """
+        for i, (codes_n, payload_size) in enumerate(member.blocks):
+            if codes_n == BLOCK_STORED:
+                raise ValueError(f"Member `{member.path}` has stored blocks, they have no codes.")
+
+            if i > 0:
+                yield array(CODES_TYPECODE, [LZWCodeTable.CLEAR_CODE])
+
+            yield from self.iter_block_codes(
+                f, codes_n, payload_size, member.max_code_width, batch_size, path=member.path,
+                start_code=member.start_code, coding=member.coding
+            )
+
+    def iter_block_codes(
+        self,
+        f: BinaryIO,
+        codes_n: int,
+        payload_size: int,
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        batch_size: int = CODES_BATCH_SIZE,
+        path: str = "",
+        start_code: int = LZWCodeTable.FIRST_CODE,
+        coding: int = CODING_NONE
+    ) -> Generator[array, None, None]:
+        """
+        Read a block's payload from `f` and unpack its codes in batches.
+
+        Entropy coded blocks are read as a whole before they are decoded,
+        bit-packed ones a chunk at a time.
+        """
+        if coding != CODING_NONE:
+            payload = f.read(payload_size)
+            if len(payload) != payload_size:
+                raise ValueError(f"Truncated member `{path}`.")
+
+            codes = self.unpack_block(payload, codes_n, max_code_width, start_code, coding)
+
+            for i in range(0, len(codes), batch_size):
+                yield codes[i:i + batch_size]
+
+            return
+
+        # Only the time spent in here counts, not the time the caller
+        # spends on a batch.
+        start = time.perf_counter_ns()
+
+        # Bit buffer, only its low `bits_n` bits are still unread
+        buffer = 0
+        bits_n = 0
+
+        chunk = b""
+        position = 0
+
+        remaining_payload = payload_size
+        codes = array(CODES_TYPECODE)
+
+        index = 0
+        width = LZWCodeTable.code_width(index, max_code_width, start_code)
+        grow_index = (1 << width) - start_code + 1
+        mask = (1 << width) - 1
+
+        for _ in range(codes_n):
+            if index == grow_index and width < max_code_width:
+                width += 1
+                grow_index = (1 << width) - start_code + 1
+                mask = (1 << width) - 1
+
+            while bits_n < width:
+                if position == len(chunk):
+                    chunk = f.read(min(READ_SIZE, remaining_payload))
+                    if not chunk:
+                        raise ValueError(f"Truncated member `{path}`.")
+
+                    remaining_payload -= len(chunk)
+                    position = 0
+
+                data = chunk[position:position + UNPACK_REFILL_SIZE]
+                position += len(data)
+
+                buffer = ((buffer & ((1 << bits_n) - 1)) << (len(data) << 3)) | int.from_bytes(data, "big")
+                bits_n += len(data) << 3
+
+            bits_n -= width
+            code = (buffer >> bits_n) & mask
+
+            codes.append(code)
+
+            if code == LZWCodeTable.CLEAR_CODE:
+                index = 0
+                width = LZWCodeTable.code_width(index, max_code_width, start_code)
+                grow_index = (1 << width) - start_code + 1
+                mask = (1 << width) - 1
+            else:
+                index += 1
+
+            if len(codes) == batch_size:
+                METRICS.add_time(STAGE_PARSE, time.perf_counter_ns() - start)
+
+                yield codes
+
+                start = time.perf_counter_ns()
+                codes = array(CODES_TYPECODE)
+
+        METRICS.add_time(STAGE_PARSE, time.perf_counter_ns() - start)
+
+        if codes:
+            yield codes
+
+    def iter_stored_block(
+        self, f: BinaryIO, payload_size: int, chunk_size: int = READ_SIZE, path: str = ""
+    ) -> Generator[bytes, None, None]:
+        """
+        Read the raw data of a stored block from `f` in chunks.
+        """
+        remaining_payload = payload_size
+
+        while remaining_payload > 0:
+            chunk = f.read(min(chunk_size, remaining_payload))
+            if not chunk:
+                raise ValueError(f"Truncated member `{path}`.")
+
+            remaining_payload -= len(chunk)
+
+            yield chunk
+
+    def write_header(self, o: BinaryIO, dictionary_id: int = 0, dictionary_entries: int = 0) -> None:
+        """
+        Write the container header, with the id and the entries count of
+        the trained dictionary the members were compressed with.
+        """
+        o.write(self.HEADER.pack(PM_MAGIC, PM_VERSION))
+        o.write(self.DICTIONARY.pack(dictionary_id, dictionary_entries))
+
+    def write_member(
+        self,
+        o: BinaryIO,
+        path: str,
+        blocks: list[array | list[int]],
+        uncompressed_size: int,
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        policy: int = RESET,
+        block_size: int = 0,
+        start_code: int = LZWCodeTable.FIRST_CODE,
+        coding: int = CODING_NONE
+    ) -> Member:
+        """
+        Write a member and the codes of each of its blocks.
+        """
+        return self.write_packed_member(
+            o,
+            path=path,
+            blocks=[
+                (len(codes), self.pack_block(codes, max_code_width, start_code, coding)) for codes in blocks
+            ],
+            uncompressed_size=uncompressed_size,
+            max_code_width=max_code_width,
+            policy=policy,
+            block_size=block_size,
+            start_code=start_code,
+            coding=coding
+        )
+
+    @METRICS.timed(STAGE_SERIALIZE)
+    def write_packed_member(
+        self,
+        o: BinaryIO,
+        path: str,
+        blocks: list[tuple[int, bytes | None]],
+        uncompressed_size: int,
+        max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+        policy: int = RESET,
+        block_size: int = 0,
+        start_code: int = LZWCodeTable.FIRST_CODE,
+        source_path: str | None = None,
+        coding: int = CODING_NONE
+    ) -> Member:
+        """
+        Write a member from the `(codes count, payload)` of each of its
+        blocks, packed with `pack_block` and the member's entropy `coding`.
+
+        Stored blocks come as `(BLOCK_STORED, None)`, their data is copied
+        from the file at `source_path` without going through user space
+        where the platform allows it.
+        """
+        encoded_path = path.encode("utf-8")
+
+        # Where the data of each block is in the source file
+        ranges: list[tuple[int, int] | None] = [None] * len(blocks)
+
+        if any(payload is None for _, payload in blocks):
+            ranges = split_data_to_blocks(data_n=uncompressed_size, block_size=block_size)
+
+            if len(ranges) != len(blocks):
+                raise ValueError(f"Member `{path}` has {len(blocks)} blocks, expected {len(ranges)}.")
+
+        member = Member(
+            path=path,
+            max_code_width=max_code_width,
+            policy=policy,
+            uncompressed_size=uncompressed_size,
+            block_size=block_size,
+            blocks=[
+                (codes_n, len(payload) if payload is not None else ranges[j][1] - ranges[j][0])
+                for j, (codes_n, payload) in enumerate(blocks)
+            ],
+            start_code=start_code,
+            coding=coding
+        )
+        member.offset = o.tell()
+
+        o.write(self.RECORD.pack(RECORD_MEMBER))
+        o.write(self.PATH.pack(len(encoded_path)))
+        o.write(encoded_path)
+        o.write(self.MEMBER.pack(max_code_width, policy, uncompressed_size, block_size, len(blocks)))
+        o.write(self.CODING.pack(coding))
+
+        for codes_n, payload_size in member.blocks:
+            o.write(self.BLOCK.pack(codes_n, payload_size))
+
+        member.payload_offset = o.tell()
+
+        for (_, payload), data_range in zip(blocks, ranges):
+            if payload is not None:
+                o.write(payload)
+                continue
+
+            start, stop = data_range
+            if FileHandler(source_path).copy_to(o, start, stop) != stop - start:
+                raise ValueError(f"File `{source_path}` changed while it was compressed.")
+
+        member.end_offset = o.tell()
+
+        return member
+
+    def write_link(self, o: BinaryIO, path: str, member: Member) -> Member:
+        """
+        Write a link at `path` to the data of `member`, an identical file
+        written earlier.
+        """
+        encoded_path = path.encode("utf-8")
+
+        link = member.linked(path)
+        link.offset = o.tell()
+
+        o.write(self.RECORD.pack(RECORD_LINK))
+        o.write(self.PATH.pack(len(encoded_path)))
+        o.write(encoded_path)
+        o.write(self.LINK.pack(member.offset))
+
+        link.end_offset = o.tell()
+
+        return link
+
+    def write_end(self, o: BinaryIO) -> None:
+        """
+        Write the end of the container.
+        """
+        o.write(self.RECORD.pack(RECORD_END))
+
+    @METRICS.timed(STAGE_SERIALIZE)
+    def write_index(self, o: BinaryIO, members: list[Member]) -> None:
+        """
+        Write the index of the members, must come after `write_end`.
+        """
+        index_offset = o.tell()
+
+        for member in members:
+            encoded_path = member.path.encode("utf-8")
+
+            o.write(self.PATH.pack(len(encoded_path)))
+            o.write(encoded_path)
+            o.write(self.INDEX_ENTRY.pack(
+                member.offset,
+                member.payload_size if member.link is None else 0,
+                member.uncompressed_size,
+                member.checksum
+            ))
+
+        o.write(self.INDEX_TRAILER.pack(index_offset, len(members), PM_INDEX_MAGIC))
+
+    def read_header(self, f: BinaryIO) -> tuple[int, int, int]:
+        """
+        Read and check the container header, returns its version, and the
+        id and the entries count of its trained dictionary (0 without one).
+        """
+        magic, version = self.HEADER.unpack(f.read(self.HEADER.size))
+
+        if magic != PM_MAGIC:
+            raise ValueError("Not a .pm container.")
+
+        if not PM_MIN_VERSION <= version <= PM_VERSION:
+            raise ValueError(f"Unsupported .pm container version `{version}`.")
+
+        if version < 6:
+            return (version, 0, 0)
+
+        return (version, *self.DICTIONARY.unpack(f.read(self.DICTIONARY.size)))
+
+    def read_member(
+        self, f: BinaryIO, start_code: int = LZWCodeTable.FIRST_CODE, version: int = PM_VERSION
+    ) -> Member | None:
+        """
+        Read the member record at the current position, `None` at the
+        end of the container. `f` is left at the start of the payload,
+        which for a link is the payload of the member it points to.
+
+        `start_code` comes from the entries count of the container's
+        trained dictionary and `version` from its header.
+        """
+        offset = f.tell()
+
+        record = f.read(self.RECORD.size)
+        if not record:
+            raise ValueError("Truncated .pm container.")
+
+        (record_type, ) = self.RECORD.unpack(record)
+        if record_type == RECORD_END:
+            return None
+
+        if record_type not in (RECORD_MEMBER, RECORD_LINK) or (record_type == RECORD_LINK and version < 5):
+            raise ValueError(f"Unknown record type `{record_type}` at offset {offset}.")
+
+        (path_length, ) = self.PATH.unpack(f.read(self.PATH.size))
+        path = f.read(path_length).decode("utf-8")
+
+        if record_type == RECORD_LINK:
+            (source_offset, ) = self.LINK.unpack(f.read(self.LINK.size))
+            end_offset = f.tell()
+
+            if source_offset >= offset:
+                raise ValueError(f"Corrupted link `{path}`: it doesn't point back.")
+
+            f.seek(source_offset)
+
+            source = self.read_member(f, start_code, version)
+            if source is None or source.link is not None:
+                raise ValueError(f"Corrupted link `{path}`: it doesn't point to a member.")
+
+            member = source.linked(path)
+            member.offset = offset
+            member.end_offset = end_offset
+
+            return member
+
+        max_code_width, policy, uncompressed_size, block_size, blocks_n = self.MEMBER.unpack(
+            f.read(self.MEMBER.size)
+        )
+
+        coding = CODING_NONE
+        if version >= 8:
+            (coding, ) = self.CODING.unpack(f.read(self.CODING.size))
+
+            if coding not in (CODING_NONE, CODING_HUFFMAN):
+                raise ValueError(f"Unknown entropy coding `{coding}` of member `{path}`.")
+        blocks = [
+            self.BLOCK.unpack(f.read(self.BLOCK.size)) for _ in range(blocks_n)
+        ]
+
+        member = Member(
+            path=path,
+            max_code_width=max_code_width,
+            policy=policy,
+            uncompressed_size=uncompressed_size,
+            block_size=block_size,
+            blocks=blocks,
+            start_code=start_code,
+            coding=coding
+        )
+        member.offset = offset
+        member.payload_offset = f.tell()
+        member.end_offset = member.payload_offset + member.payload_size
+
+        return member
+
+    def read_members(
+        self, f: BinaryIO
+    ) -> Generator[tuple[Member, Generator[array, None, None]], None, None]:
+        """
+        Read the members of a container, each one comes with a generator
+        of its codes batches which has to be consumed before moving on to
+        the next member. Payloads that aren't consumed are skipped, so
+        scanning the members only reads their headers.
+        """
+        version, _, dictionary_entries = self.read_header(f)
+        start_code = LZWCodeTable.FIRST_CODE + dictionary_entries
+
+        while (member := self.read_member(f, start_code, version)) is not None:
+            yield (member, self.iter_codes(f, member))
+
+            f.seek(member.end_offset)
+
+    def read_index(self, f: BinaryIO) -> list[IndexEntry] | None:
+        """
+        Read the index of a container, `None` if it doesn't have one.
+        """
+        f.seek(0, io.SEEK_END)
+        if f.tell() < self.HEADER.size + self.INDEX_TRAILER.size:
+            return None
+
+        f.seek(-self.INDEX_TRAILER.size, io.SEEK_END)
+        index_offset, entries_n, magic = self.INDEX_TRAILER.unpack(f.read(self.INDEX_TRAILER.size))
+
+        if magic != PM_INDEX_MAGIC:
+            return None
+
+        f.seek(index_offset)
+
+        entries = list()
+        for _ in range(entries_n):
+            (path_length, ) = self.PATH.unpack(f.read(self.PATH.size))
+            path = f.read(path_length).decode("utf-8")
+
+            offset, compressed_size, uncompressed_size, checksum = self.INDEX_ENTRY.unpack(
+                f.read(self.INDEX_ENTRY.size)
+            )
+
+            entries.append(IndexEntry(
+                path=path,
+                offset=offset,
+                compressed_size=compressed_size,
+                uncompressed_size=uncompressed_size,
+                checksum=checksum
+            ))
+
+        return entries
+
+    def read_text_members(
+        self, f: BinaryIO, slice_size: int = TEXT_SLICE_SIZE
+    ) -> Generator[tuple[str, Generator[array, None, None]], None, None]:
+        """
+        Read the members of a text `.pm` file, each one comes with a
+        generator of its codes batches which has to be consumed before
+        moving on to the next member.
+
+        The file is mapped and the region of a member is parsed
+        `slice_size` bytes at a time (see `iter_text_codes`).
+        """
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # Empty files can't be mapped
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+
+            while (position := data.find(TEXT_PATH, position)) >= 0:
+                line_end = data.find(b"\n", position)
+                if line_end < 0:
+                    raise ValueError("Truncated text .pm file.")
+
+                path = data[position + len(TEXT_PATH):line_end].strip().decode("utf-8")
+
+                end = data.find(TEXT_EOF, line_end)
+                if end < 0:
+                    raise ValueError(f"Truncated member `{path}`.")
+
+                yield (path, self.iter_text_codes(data, line_end, end, slice_size, path=path))
+
+                position = end + len(TEXT_EOF)
+
+    def iter_text_codes(
+        self,
+        data: mmap.mmap | bytes,
+        start: int,
+        end: int,
+        slice_size: int = TEXT_SLICE_SIZE,
+        path: str = ""
+    ) -> Generator[array, None, None]:
+        """
+        Parse the codes of the text region `data[start:end]` a slice at
+        a time. Every slice ends at a separator so no code is cut, its
+        `--` line markers are blanked out and the rest is split and
+        converted with `map(int, ...)`.
+        """
+        while start < end:
+            parse_start = time.perf_counter_ns()
+
+            stop = min(start + slice_size, end)
+            if stop < end:
+                stop = max(data.rfind(b" ", start, stop), data.rfind(b"\n", start, stop))
+
+                if stop <= start:
+                    raise ValueError(f"Corrupted member `{path}`: no separator in {slice_size} bytes.")
+
+            region = data[start:stop].replace(TEXT_CODES, b" ")
+            if TEXT_LEGACY_INDEX in region:
+                region = region.replace(TEXT_LEGACY_INDEX, b" ")
+
+            codes = array(CODES_TYPECODE, map(int, region.split()))
+
+            METRICS.add_time(STAGE_PARSE, time.perf_counter_ns() - parse_start)
+
+            if codes:
+                yield codes
+
+            start = stop
+
+    def find_member(self, f: BinaryIO, path: str) -> Member:
+        """
+        Find a member by its path, seeking straight to it through the index
+        when the container has one. `f` is left at the start of its payload.
+        """
+        entries = self.read_index(f)
+
+        if entries is None:
+            # No index, scanning the member headers still skips the payloads
+            f.seek(0)
+
+            for member, _ in self.read_members(f):
+                if member.path == path:
+                    f.seek(member.payload_offset)
+                    return member
+
+            raise KeyError(f"No member `{path}` in the container.")
+
+        for entry in entries:
+            if entry.path == path:
+                f.seek(0)
+                version, _, dictionary_entries = self.read_header(f)
+
+                f.seek(entry.offset)
+
+                member = self.read_member(f, LZWCodeTable.FIRST_CODE + dictionary_entries, version)
+                member.checksum = entry.checksum
+
+                return member
+
+        raise KeyError(f"No member `{path}` in the container.")
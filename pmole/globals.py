@@ -27,7 +27,7 @@ __all__ = [
     "ROOT_CONFIG_DIR",
     "CACHE_DIR",
     "DICTIONARY_CACHE_FILE_PATH",
-    "REVERSE_DICTIONARY_CACHE_FILE_PATH"
+    "TRAINED_DICTIONARIES_DIR"
 ]
 
 import os
@@ -50,5 +50,5 @@ elif PLATFORM == PL_WINDOWS:
     ROOT_CONFIG_DIR = f"{HOME_DIRECTORY}{SLASH}pmole"
 
 CACHE_DIR = ROOT_CONFIG_DIR + SLASH + "cache"
-DICTIONARY_CACHE_FILE_PATH = CACHE_DIR + SLASH + "pre_generated_dictionary.json"
-REVERSE_DICTIONARY_CACHE_FILE_PATH = CACHE_DIR + SLASH + "pre_generated_reverse_dictionary.json"
+DICTIONARY_CACHE_FILE_PATH = CACHE_DIR + SLASH + "pre_generated_dictionary.bin"
+TRAINED_DICTIONARIES_DIR = CACHE_DIR + SLASH + "dictionaries"
@@ -0,0 +1,273 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__all__ = [
+    "LZWHuffman",
+    "MAX_HUFFMAN_LENGTH"
+]
+
+import struct
+
+from array import array
+from collections import Counter
+
+from pmole.lzw import LZWCodeTable
+from pmole.lzw import DEFAULT_MAX_CODE_WIDTH
+from pmole.lzw import CODES_TYPECODE
+
+from pmole.metrics import METRICS
+from pmole.metrics import STAGE_SERIALIZE
+from pmole.metrics import STAGE_PARSE
+
+# Codes up to CLEAR are their own symbol, the symbols after them code the
+# distance of the other codes to the newest code of the table
+DISTANCE_SYMBOL: int = LZWCodeTable.CLEAR_CODE + 1
+
+# Distances below this one have a symbol each, the others share a symbol
+# with the distances of the same bit length and top two bits
+DIRECT_DISTANCES: int = 4
+
+# Longest Huffman code, the lengths table stores them on `LENGTH_WIDTH` bits
+MAX_HUFFMAN_LENGTH: int = 24
+LENGTH_WIDTH: int = 5
+
+# Stubs
+class LZWHuffman: ...
+
+# Implementations
+class LZWHuffman:
+    """
+    Canonical Huffman coding of an LZW code stream.
+
+    Literal codes and CLEAR are symbols of their own. Any other code is
+    coded by its distance to the newest code of the table, which the
+    decoder knows from the number of codes since the last CLEAR: recent
+    sequences are the most likely to show up again. Distances are split
+    the way DEFLATE splits them, a symbol for their bit length and top
+    two bits and the remaining bits as they are.
+
+    Encoded codes look like this:
+        >>> huffman stream length in bits (u64)
+            | code length of every symbol (5 bits each)
+            | Huffman coded symbols | extra bits of the distances
+
+    Each part starts on a byte boundary. Decoding is table driven, the
+    canonical code is rebuilt from the lengths and `bitarray` walks it.
+    """
+    HEADER: struct.Struct = struct.Struct("<Q")
+
+    def __init__(
+            self,
+            max_code_width: int = DEFAULT_MAX_CODE_WIDTH,
+            start_code: int = LZWCodeTable.FIRST_CODE
+    ) -> None:
+        self.max_code_width = max_code_width
+        self.start_code = start_code
+        self.limit = 1 << max_code_width
+
+        # Distances are below `limit`, at most `max_code_width` bits long
+        self.alphabet_size = DISTANCE_SYMBOL + 2 * max_code_width
+
+        self.lengths_size = (self.alphabet_size * LENGTH_WIDTH + 7) // 8
+
+    @staticmethod
+    def code_lengths(frequencies: Counter) -> dict[int, int]:
+        """
+        Huffman code length of every symbol, no longer than
+        `MAX_HUFFMAN_LENGTH` (rare symbols get more frequent until it fits).
+        """
+        from bitarray.util import huffman_code
+
+        if len(frequencies) == 1:
+            return {symbol: 1 for symbol in frequencies}
+
+        while True:
+            lengths = {
+                symbol: len(code) for symbol, code in huffman_code(frequencies, endian="big").items()
+            }
+
+            if max(lengths.values()) <= MAX_HUFFMAN_LENGTH:
+                return lengths
+
+            frequencies = Counter({symbol: (n >> 1) | 1 for symbol, n in frequencies.items()})
+
+    @staticmethod
+    def canonical(lengths: list[int]) -> tuple[list[int], list[int]]:
+        """
+        The canonical code of the symbols with their code `lengths` (0
+        for unused ones), as the count of codes of every length and the
+        symbols in code order.
+        """
+        count = [0] * (MAX_HUFFMAN_LENGTH + 1)
+        for length in lengths:
+            if length:
+                count[length] += 1
+
+        symbols = sorted(
+            (symbol for symbol, length in enumerate(lengths) if length),
+            key=lambda symbol: (lengths[symbol], symbol)
+        )
+
+        return (count, symbols)
+
+    @METRICS.timed(STAGE_SERIALIZE)
+    def encode(self, codes: array | list[int]) -> bytes:
+        """
+        Huffman code the codes of a block.
+        """
+        from bitarray import bitarray
+        from bitarray.util import int2ba
+
+        symbols = array("H")
+        extras = bitarray(endian="big")
+
+        emit = symbols.append
+        start_code = self.start_code
+        limit = self.limit
+
+        index = 0
+        for code in codes:
+            if code <= LZWCodeTable.CLEAR_CODE:
+                emit(code)
+            else:
+                distance = min(start_code + index, limit) - 1 - code
+                if distance < 0:
+                    raise ValueError(f"Code `{code}` isn't in the table yet.")
+
+                if distance < DIRECT_DISTANCES:
+                    emit(DISTANCE_SYMBOL + distance)
+                else:
+                    bits_n = distance.bit_length()
+                    extra_n = bits_n - 2
+
+                    emit(DISTANCE_SYMBOL + 2 * (bits_n - 1) + ((distance >> extra_n) & 1))
+                    extras += int2ba(distance & ((1 << extra_n) - 1), length=extra_n, endian="big")
+
+            index = 0 if code == LZWCodeTable.CLEAR_CODE else index + 1
+
+        lengths = [0] * self.alphabet_size
+        if symbols:
+            for symbol, length in self.code_lengths(Counter(symbols)).items():
+                lengths[symbol] = length
+
+        count, ordered = self.canonical(lengths)
+
+        code_dict = dict()
+        code = 0
+        position = 0
+        for length in range(1, MAX_HUFFMAN_LENGTH + 1):
+            for symbol in ordered[position:position + count[length]]:
+                code_dict[symbol] = int2ba(code, length=length, endian="big")
+                code += 1
+
+            position += count[length]
+            code <<= 1
+
+        table = bitarray(endian="big")
+        for length in lengths:
+            table += int2ba(length, length=LENGTH_WIDTH, endian="big")
+
+        stream = bitarray(endian="big")
+        if symbols:
+            stream.encode(code_dict, symbols)
+
+        return b"".join((
+            self.HEADER.pack(len(stream)),
+            table.tobytes(),
+            stream.tobytes(),
+            extras.tobytes()
+        ))
+
+    @METRICS.timed(STAGE_PARSE)
+    def decode(self, payload: bytes, codes_n: int) -> array:
+        """
+        Decode `codes_n` Huffman coded codes.
+        """
+        from bitarray import bitarray
+        from bitarray.util import ba2int
+        from bitarray.util import canonical_decode
+
+        if len(payload) < self.HEADER.size + self.lengths_size:
+            raise ValueError("Truncated Huffman coded block.")
+
+        (stream_n, ) = self.HEADER.unpack_from(payload)
+
+        bits = bitarray(endian="big")
+        bits.frombytes(payload[self.HEADER.size:])
+
+        lengths = [
+            ba2int(bits[i:i + LENGTH_WIDTH])
+            for i in range(0, self.alphabet_size * LENGTH_WIDTH, LENGTH_WIDTH)
+        ]
+        if max(lengths) > MAX_HUFFMAN_LENGTH:
+            raise ValueError("Corrupted Huffman coded block: code too long.")
+
+        position = self.lengths_size * 8
+        extras_position = position + (stream_n + 7) // 8 * 8
+
+        if extras_position > len(bits):
+            raise ValueError("Truncated Huffman coded block.")
+
+        stream = bits[position:position + stream_n]
+        extras = bits[extras_position:]
+        position = 0
+
+        codes = array(CODES_TYPECODE)
+        if codes_n == 0:
+            return codes
+
+        count, ordered = self.canonical(lengths)
+
+        emit = codes.append
+        start_code = self.start_code
+        limit = self.limit
+
+        index = 0
+        for symbol in canonical_decode(stream, count, ordered):
+            if symbol < DISTANCE_SYMBOL:
+                code = symbol
+            else:
+                distance = symbol - DISTANCE_SYMBOL
+
+                if distance >= DIRECT_DISTANCES:
+                    extra_n = (distance >> 1) - 1
+
+                    distance = ((2 | (distance & 1)) << extra_n) + ba2int(
+                        extras[position:position + extra_n]
+                    )
+                    position += extra_n
+
+                code = min(start_code + index, limit) - 1 - distance
+                if code < 0:
+                    raise ValueError("Corrupted Huffman coded block: code out of the table.")
+
+            emit(code)
+
+            index = 0 if code == LZWCodeTable.CLEAR_CODE else index + 1
+
+            if len(codes) == codes_n:
+                break
+
+        if len(codes) != codes_n:
+            raise ValueError(f"Truncated Huffman coded block: {len(codes)} codes out of {codes_n}.")
+
+        return codes
@@ -0,0 +1,55 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__all__ = [
+    "logger",
+    "setup_logger",
+    "LOG_FILE_PATH"
+]
+
+# The log file of the cli, in the current directory
+LOG_FILE_PATH: str = "pmole.log"
+
+# Stubs
+class LazyLogger: ...
+
+def setup_logger(log_file_path: str = LOG_FILE_PATH) -> None: ...
+
+# Implementations
+class LazyLogger:
+    """
+    Stands for the loguru logger, which is only imported the first time
+    it is used. Importing loguru is the largest part of the startup time
+    of the cli.
+    """
+    def __getattr__(self, name: str):
+        from loguru import logger
+
+        return getattr(logger, name)
+
+def setup_logger(log_file_path: str = LOG_FILE_PATH) -> None:
+    """
+    Add the log file sink, only done once a cli command runs.
+    """
+    logger.add(log_file_path, rotation="10 MB")
+
+logger: LazyLogger = LazyLogger()
@@ -22,30 +22,73 @@
 
 __all__ = [
     "LZW",
-    "LZWDictionary"
+    "LZWDictionary",
+    "LZWBaseTable",
+    "LZWCodeTable",
+    "LZWTrainedDictionary",
+    "LZWCompressor",
+    "LZWDecompressor",
+    "RESET",
+    "FREEZE",
+    "MIN_CODE_WIDTH",
+    "MAX_CODE_WIDTH",
+    "DEFAULT_MAX_CODE_WIDTH",
+    "CODES_TYPECODE",
+    "DEFAULT_TRAINED_ENTRIES",
+    "DEFAULT_SAMPLE_SIZE"
 ]
 
-import json
+import os
+import mmap
+import zlib
+import struct
 
-from pathlib import Path
-from loguru import logger
-from typing import Generator
-from multiprocessing import (
-    Process,
-    Manager
-)
+from array import array
+from pmole.log import logger
+from typing import Iterable
 
 # Globals
-from pmole.globals import (
-    DICTIONARY_CACHE_FILE_PATH,
-    REVERSE_DICTIONARY_CACHE_FILE_PATH
-)
+from pmole.globals import DICTIONARY_CACHE_FILE_PATH
+from pmole.globals import TRAINED_DICTIONARIES_DIR
 
 # Utils
-from pmole.utils import measure_time
+from pmole.metrics import METRICS
+from pmole.metrics import STAGE_DICTIONARY_INIT
+from pmole.metrics import STAGE_ENCODE
+from pmole.metrics import STAGE_DECODE
+
+# Base table cache
+BASE_TABLE_MAGIC: bytes = b"PMDICT"
+BASE_TABLE_VERSION: int = 1
+
+# Trained dictionaries
+TRAINED_DICTIONARY_MAGIC: bytes = b"PMTDIC"
+TRAINED_DICTIONARY_VERSION: int = 1
+TRAINED_DICTIONARY_EXTENSION: str = ".pmdict"
+DEFAULT_TRAINED_ENTRIES: int = 1 << 12
+DEFAULT_SAMPLE_SIZE: int = 4 << 20  # In bytes, across all the sampled files
+MIN_FILE_SAMPLE_SIZE: int = 1 << 12
+
+# What to do once the code table is full
+RESET: int = 0  # Emit a CLEAR code and start over from the base alphabet
+FREEZE: int = 1  # Keep using the table without adding new codes
+
+# Code widths (in bits)
+MIN_CODE_WIDTH: int = 9
+MAX_CODE_WIDTH: int = 24
+DEFAULT_MAX_CODE_WIDTH: int = 16
+
+# Codes are kept in `array`s of this type, 4 bytes per code instead of
+# the 36 a list of ints takes. "I" is 4 bytes on every common platform.
+CODES_TYPECODE: str = "I" if array("I").itemsize * 8 >= MAX_CODE_WIDTH else "L"
 
 class LZW: ...
 class LZWDictionary: ...
+class LZWBaseTable: ...
+class LZWCodeTable: ...
+class LZWTrainedDictionary: ...
+class LZWCompressor: ...
+class LZWDecompressor: ...
 
 class LZW:
     """
@@ -54,74 +97,148 @@ class LZW:
     def __init__(self) -> None:
         pass
 
-    @measure_time
     def compress(
-        self, data: Generator, dictionary: LZWDictionary | None = None
-    ) -> LZWDictionary:
+        self,
+        data: bytes | memoryview | Iterable[bytes | memoryview],
+        dictionary: LZWCodeTable | LZWDictionary | None = None
+    ) -> array | list[int]:
         """
         Compress data
+
+        Args:
+            data (bytes | memoryview | Iterable[bytes | memoryview]): A buffer or an
+                iterable of buffers, memory views (of a mapped file) are read in place.
+            dictionary (LZWCodeTable | LZWDictionary | None): The code table to use,
+                a `LZWDictionary` selects the legacy unicode alphabet.
+
+        Returns:
+            array | list[int]: The emitted codes, a list with a `LZWDictionary`.
         """
-        if dictionary is None:
-            dictionary = LZWDictionary()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = (data, )
+
+        if isinstance(dictionary, LZWDictionary):
+            return self.__compress_legacy__(data=data, dictionary=dictionary)
+
+        compressor = LZWCompressor(dictionary=dictionary)
+
+        compressed_data = array(CODES_TYPECODE)
+
+        for buffer in data:
+            compressor.feed(buffer, output=compressed_data)
+
+        compressor.flush(output=compressed_data)
+
+        return compressed_data
+
+    def decompress(
+        self,
+        compressed_data: array | list[int],
+        dictionary: LZWCodeTable | LZWDictionary | None = None
+    ) -> bytes:
+        """
+        Decompress data using the LZW algorithm.
+
+        Args:
+            compressed_data (array | list[int]): The dictionary indexes to decompress.
+            dictionary (LZWCodeTable | LZWDictionary | None): The code table used to
+                compress the data.
+
+        Returns:
+            bytes: The decompressed data.
+        """
+        if not compressed_data:
+            return b""
+
+        if isinstance(dictionary, LZWDictionary):
+            return self.__decompress_legacy__(
+                compressed_data=compressed_data, dictionary=dictionary
+            )
+
+        return LZWDecompressor(dictionary=dictionary).feed(compressed_data)
+
+    def __compress_legacy__(
+        self, data: Iterable[bytes], dictionary: LZWDictionary
+    ) -> list[int]:
+        """
+        Compress data using the legacy unicode `LZWDictionary`.
+        """
+        if len(dictionary.dictionary) == 0:
             dictionary.create()
 
         compressed_data = []
+        emit = compressed_data.append
 
-        last_char = bytes([])  # Empty bytes
+        learned = dictionary.dictionary
         dict_size = dictionary.INIT_DICT_SIZE
 
+        # The current sequence is kept as an integer state, 0 is the empty
+        # sequence and `byte + 1` the single bytes. Every transition
+        # `(state << 8) | byte` is resolved once against the dictionary,
+        # then it is a single dict access.
+        sequences = [b""] + [bytes([i]) for i in range(256)]
+        states = {sequence: state for state, sequence in enumerate(sequences)}
+        transitions: dict[int, int] = dict()
+        lookup = transitions.get
+
+        state = 0
+
         for buffer in data:
             for char in buffer:
-                current_sequence = last_char + bytes([char])
+                key = (state << 8) | char
 
-                exists, idx = dictionary.exists(key=current_sequence)
-                if exists:
-                    last_char = current_sequence
-                else:
-                    idx = dict_size
-                    
+                next_state = lookup(key)
+                if next_state is not None:
+                    state = next_state
+                    continue
+
+                current_sequence = sequences[state] + sequences[char + 1]
+
+                exists = current_sequence in learned or dictionary.base_value(current_sequence) is not None
+                if not exists:
                     try:
-                        compressed_data.append(dictionary.get_value(key=last_char))
+                        emit(dictionary.get_value(key=sequences[state]))
                     except KeyError:
-                        logger.warning(f"Key not found error, faild to fetch the value for key '{last_char}'")
-                    
-                    dictionary.add(key=current_sequence, value=idx)
+                        logger.warning(f"Key not found error, faild to fetch the value for key '{sequences[state]}'")
+
+                    dictionary.add(key=current_sequence, value=dict_size)
                     dict_size += 1
 
-                    last_char = bytes([char])
+                # Either way the sequence is known from now on
+                known = states.get(current_sequence)
+                if known is None:
+                    known = len(sequences)
 
-        if last_char:
-            compressed_data.append(dictionary.get_value(last_char))
+                    sequences.append(current_sequence)
+                    states[current_sequence] = known
 
-        return compressed_data
+                transitions[key] = known
 
-    @measure_time
-    def decompress(
-        self, compressed_data: list[int], dictionary: LZWDictionary | None = None
-    ) -> str:
-        """
-        Decompress data using the LZW algorithm.
+                state = known if exists else char + 1
 
-        Args:
-            compressed_data (list[int]): The list of dictionary indexes to decompress.
+        if state:
+            emit(dictionary.get_value(sequences[state]))
 
-        Returns:
-            str: The decompressed string.
-        """
-        if not compressed_data:
-            return ""
+        return compressed_data
 
-        if dictionary is None:
-            dictionary = LZWDictionary()
+    def __decompress_legacy__(
+        self, compressed_data: list[int], dictionary: LZWDictionary
+    ) -> bytes:
+        """
+        Decompress data using the legacy unicode `LZWDictionary`.
+        """
+        if len(dictionary.dictionary) == 0:
             dictionary.create()
 
         result = list()
 
         dict_size = dictionary.INIT_DICT_SIZE
-        w = dictionary.reverse_dictionary[compressed_data.pop(0)]
+        tokens = iter(compressed_data)
+
+        w = dictionary.get_key(next(tokens))
         result.append(w)
 
-        for token in compressed_data:
+        for token in tokens:
             exists, value = dictionary.exists(value=token)
             if exists:
                 entry = value
@@ -132,7 +249,7 @@ class LZW:
                 # raise ValueError(f"Invalid token encountered: {token = }")
 
             result.append(entry)
-            
+
             dictionary.add(key=w + entry[0:1], value=dict_size)
 
             dict_size += 1
@@ -152,10 +269,15 @@ class LZWDictionary:
             1: [...],
             ...
         }
+
+    The base alphabet (every code point of `BASIC_UNICODE` that can be
+    encoded in UTF-8) is implicit: a base value is its code point and its
+    key is the code point encoded in UTF-8, so only the learned sequences
+    are stored in `dictionary` and `reverse_dictionary`.
     """
 
-    values: list[int] = list()
-    keys: list[str] = list()
+    values: list[int]
+    keys: list[str]
     items: tuple
 
     # The full range is 1114112
@@ -166,6 +288,13 @@ class LZWDictionary:
     FULL_UNICODE_RANGE: tuple[int, int] = (0x00, 0x10FFFF + 1)
     BASIC_SYMBOLS: tuple[int, int] = (0x2000, 0x26FF + 1)
     EMOJIS: tuple[int, int] = (0x1F300, 0x1FAFF + 1)
+    SURROGATES: tuple[int, int] = (0xD800, 0xDFFF + 1)
+
+    # The implicit base alphabet
+    BASE_RANGE: tuple[int, int] = BASIC_UNICODE
+
+    # Shared by every dictionary of the process
+    base_table: LZWBaseTable | None = None
 
     VALUE: str = "idx"
     COUNT: str = "count"
@@ -173,10 +302,12 @@ class LZWDictionary:
 
     def __init__(self) -> None:
         self.dictionary = dict()
+        self.values = list()
         self.keys = list()
         self.items = tuple()
 
         self.reverse_dictionary = dict()  # Reverse mapping (doesn't include the header)
+        self.base: LZWBaseTable | None = None
 
     # def __repr__(self):
     #     max_pairs = 100
@@ -202,47 +333,98 @@ class LZWDictionary:
     #     return table.__str__()
 
     @staticmethod
-    def check_cache_exists() -> bool:
-        dictionary_file = Path(DICTIONARY_CACHE_FILE_PATH)
-        reverse_dictionary_file = Path(REVERSE_DICTIONARY_CACHE_FILE_PATH)
+    def check_cache_exists(path: str | None = None) -> bool:
+        """
+        Is there an up to date base table in the cache.
+        """
+        try:
+            LZWDictionary.load_from_temp(path=path)
+        except (OSError, ValueError):
+            return False
 
-        return (
-            dictionary_file.stat().st_size > 0
-            and reverse_dictionary_file.stat().st_size > 0
-        )
+        return True
 
     @staticmethod
-    def load_from_temp() -> tuple[dict[str, list], dict[int, str]]:
-        cached_dictionary: dict[str, list] = dict()
-        cached_reverse_dictionary: dict = dict()
+    def load_from_temp(path: str | None = None) -> LZWBaseTable:
+        """
+        Memory-map the cached base table, raises `ValueError` if it's stale or corrupt.
+        """
+        if path is None:
+            path = DICTIONARY_CACHE_FILE_PATH
 
-        with open(DICTIONARY_CACHE_FILE_PATH, "r") as f:
-            cached_dictionary = json.load(f)
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-        with open(REVERSE_DICTIONARY_CACHE_FILE_PATH, "r") as f:
-            cached_reverse_dictionary = json.load(f)
-            cached_reverse_dictionary = {
-                int(key): element for key, element in cached_reverse_dictionary.items()
-            }
+        try:
+            base_table = LZWBaseTable(
+                buffer=buffer,
+                base_range=LZWDictionary.BASE_RANGE,
+                surrogates=LZWDictionary.SURROGATES
+            )
+        except ValueError:
+            buffer.close()
+            raise
 
-        logger.debug(f"Loaded dictionary: {list(cached_dictionary.items())[:10]}")
-        logger.debug(f"Loaded reverse dictionary: {list(cached_reverse_dictionary.items())[:10]}")
+        logger.debug(f"Loaded base table from `{path}`: {base_table.size} entries")
 
-        return (cached_dictionary, cached_reverse_dictionary)
+        return base_table
 
     @staticmethod
-    def save_dictionary_to_cache(
-        dictionary: dict[str, list], reverse_dictionary: dict[int, str]
-    ) -> None:
-        with open(DICTIONARY_CACHE_FILE_PATH, "w") as o:
-            json.dump(dictionary, o)
+    def save_dictionary_to_cache(path: str | None = None) -> bytes:
+        """
+        Build the base table and save it to the cache.
+        """
+        if path is None:
+            path = DICTIONARY_CACHE_FILE_PATH
+
+        buffer = LZWBaseTable.build(
+            base_range=LZWDictionary.BASE_RANGE,
+            surrogates=LZWDictionary.SURROGATES
+        )
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write then rename, so a concurrent process never maps a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as o:
+            o.write(buffer)
+
+        os.replace(temp_path, path)
+
+        logger.debug(f"Saved base table to `{path}`")
 
-        with open(REVERSE_DICTIONARY_CACHE_FILE_PATH, "w") as o:
-            json.dump(reverse_dictionary, o)
+        return buffer
+
+    @classmethod
+    def load_base_table(cls, path: str | None = None) -> LZWBaseTable:
+        """
+        Get the base table, it is loaded from the cache once per process and
+        regenerated when missing, stale or corrupt.
+        """
+        if cls.base_table is not None:
+            return cls.base_table
+
+        try:
+            cls.base_table = cls.load_from_temp(path=path)
+        except (OSError, ValueError) as error:
+            logger.debug(f"Base table cache unusable ({error}), regenerating...")
+
+            try:
+                buffer = cls.save_dictionary_to_cache(path=path)
+            except OSError as error:
+                logger.warning(f"Failed to save the base table to the cache: {error}")
+
+                buffer = LZWBaseTable.build(base_range=cls.BASE_RANGE, surrogates=cls.SURROGATES)
+
+            cls.base_table = LZWBaseTable(
+                buffer=buffer,
+                base_range=cls.BASE_RANGE,
+                surrogates=cls.SURROGATES
+            )
 
-        logger.debug(f"Saved dictionary: {list(dictionary.items())[:10]}")
-        logger.debug(f"Saved reverse dictionary: {list(reverse_dictionary.items())[:10]}")
+        return cls.base_table
 
+    @METRICS.timed(STAGE_DICTIONARY_INIT)
     def create(
         self,
         columns: list[str] | None = None,
@@ -259,29 +441,46 @@ class LZWDictionary:
 
         self.dictionary["char"] = columns
 
-        # NOTE: Testing loading cached dictionary
-        # it doesn't work
-        # if generate_default_dict:
-        #     if self.check_cache_exists():
-        #         logger.debug("Found dictionary in the cache.")
-        #         self.dictionary, self.reverse_dictionary = self.load_from_temp()
-        #     else:
-        #         logger.debug("Dictionary was not found in the cache, regenerating...")
-
-        #         self.__generate_dict__()
-        #         LZWDictionary.save_dictionary_to_cache(
-        #             dictionary=self.dictionary,
-        #             reverse_dictionary=self.reverse_dictionary,
-        #         )
-
         if generate_default_dict:
-            logger.debug("Generating dictionary")
-            self.__generate_dict__()
+            self.base = self.load_base_table()
+            self.INIT_DICT_SIZE = self.base.size
 
         self.keys = list(self.dictionary.keys()) # dict_items -> list
         
-        logger.debug(f"Generated dictionary keys: {self.keys[:10] = }\n{self.keys[-10:] = }")
-        
+        logger.debug(f"Created dictionary with {self.INIT_DICT_SIZE} implicit base entries")
+
+    def base_key(self, value: int) -> bytes | None:
+        """
+        Get the key of a base value, `None` if it isn't one.
+        """
+        if not isinstance(value, int) or self.base is None:
+            return None
+
+        return self.base.get_key(value)
+
+    def base_value(self, key: bytes) -> int | None:
+        """
+        Get the value of a base key, `None` if it isn't one.
+        """
+        if not isinstance(key, (bytes, bytearray)) or self.base is None:
+            return None
+
+        # A code point takes at most 4 bytes in UTF-8
+        if not 1 <= len(key) <= 4:
+            return None
+
+        try:
+            char = key.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+        if len(char) != 1:
+            return None
+
+        value = ord(char)
+
+        return value if self.BASE_RANGE[0] <= value < self.BASE_RANGE[1] else None
+
     def add(
         self,
         key: bytes,
@@ -293,10 +492,7 @@ class LZWDictionary:
         """
         # value is the idx of the character
         if value is None:
-            if isinstance(self.values[-1], str):
-                value = 0
-            else:
-                value = self.values[-1] + 1
+            value = self.values[-1] + 1 if self.values else self.INIT_DICT_SIZE
 
         self.dictionary[key] = [value, 1]
 
@@ -311,19 +507,26 @@ class LZWDictionary:
         """
         Get key using value
         """
-        return self.reverse_dictionary[value]
+        if value in self.reverse_dictionary:
+            return self.reverse_dictionary[value]
+
+        key = self.base_key(value)
+        if key is None:
+            raise KeyError(value)
+
+        return key
 
     def get_value(self, key) -> bytes:
         """
         Get value using key.
         """
-        return self.dictionary[key][0]
+        return self.get_row(key)[0]
 
     def get_count(self, key) -> int:
         """
         Get the count of a value using the key.
         """
-        return self.dictionary[key][1]
+        return self.get_row(key)[1]
 
     def get_column(self, key, column: str):
         """
@@ -331,7 +534,20 @@ class LZWDictionary:
         """
         index = self.HEADERS.index(column)
 
-        return self.dictionary[key][index]
+        return self.get_row(key)[index]
+
+    def get_row(self, key) -> list:
+        """
+        Get the row of a key, base keys get a fresh `[value, 0]` row.
+        """
+        if key in self.dictionary:
+            return self.dictionary[key]
+
+        value = self.base_value(key)
+        if value is None:
+            raise KeyError(key)
+
+        return [value, 0]
 
     def increase_count(self, key) -> None:
         """
@@ -359,23 +575,27 @@ class LZWDictionary:
         """
         Does the value exists or not.
         """
-        if key is not None and key in self.keys:
+        if key is not None and key in self.dictionary:
             logger.debug(
-                f"Found key `{key}` in `self.keys`: {key} = {self.dictionary[key][0]}"
+                f"Found key `{key}` in `self.dictionary`: {key} = {self.dictionary[key][0]}"
             )
 
             return (True, self.dictionary[key][0])
+        if key is not None and (base_value := self.base_value(key)) is not None:
+            return (True, base_value)
         if value is not None and value in self.reverse_dictionary:
             logger.debug(
                 f"Found value `{value}` in `self.reverse_dictionary`: {value} = {self.reverse_dictionary[value]}"
             )
 
             return (True, self.reverse_dictionary[value])
+        if value is not None and (base_key := self.base_key(value)) is not None:
+            return (True, base_key)
 
         log_msg = (
             [f"value `{value}`", "`self.reverse_dictionary`"]
             if value is not None
-            else [f"key `{key}`", "`self.keys`"]
+            else [f"key `{key}`", "`self.dictionary`"]
         )
         logger.debug(f"Not found {log_msg[0]} in {log_msg[1]}")
 
@@ -396,73 +616,695 @@ class LZWDictionary:
         self.dictionary.clear()
         self.reverse_dictionary.clear()
 
-        self.keys, self.items = (list(), tuple())
+        self.values, self.keys, self.items = (list(), list(), tuple())
+        self.base = None
+        self.INIT_DICT_SIZE = 0
+
+
+class LZWBaseTable:
+    """
+    Prebuilt base alphabet of `LZWDictionary`, kept as a memory-mappable
+    binary file under `CACHE_DIR`.
+
+    The table's layout looks like this:
+        >>> BASE_TABLE_MAGIC | version (u16) | fingerprint (u32)
+                | entries (u32) | size (u32) | checksum (u32)
+            offsets ((entries + 1) x u32)
+            keys (utf-8)
+
+    Entry `i` is the key of the code point `base_range[0] + i`, code points
+    that can't be encoded (surrogates) have an empty key.
+    """
+    HEADER: struct.Struct = struct.Struct("<6sHIIII")
+    OFFSET: struct.Struct = struct.Struct("<I")
+
+    def __init__(
+            self,
+            buffer: bytes | mmap.mmap,
+            base_range: tuple[int, int],
+            surrogates: tuple[int, int]
+    ) -> None:
+        if len(buffer) < self.HEADER.size:
+            raise ValueError("Truncated base table.")
+
+        magic, version, fingerprint, entries, size, checksum = self.HEADER.unpack_from(buffer, 0)
+
+        if magic != BASE_TABLE_MAGIC or version != BASE_TABLE_VERSION:
+            raise ValueError("Unsupported base table.")
+
+        if fingerprint != self.fingerprint(base_range, surrogates):
+            raise ValueError("Stale base table, the alphabet changed.")
+
+        keys_start = self.HEADER.size + (entries + 1) * self.OFFSET.size
+        if len(buffer) < keys_start:
+            raise ValueError("Truncated base table.")
+
+        (keys_size, ) = self.OFFSET.unpack_from(buffer, keys_start - self.OFFSET.size)
+        if len(buffer) != keys_start + keys_size:
+            raise ValueError("Truncated base table.")
+
+        if zlib.crc32(memoryview(buffer)[self.HEADER.size:]) != checksum:
+            raise ValueError("Corrupt base table.")
+
+        self.buffer = buffer
+        self.start = base_range[0]
+        self.entries = entries
+        self.size = size
+        self.keys_start = keys_start
+
+    def get_key(self, value: int) -> bytes | None:
+        """
+        Get the key of a base value, `None` if it isn't one.
+        """
+        index = value - self.start
+        if not 0 <= index < self.entries:
+            return None
+
+        position = self.HEADER.size + index * self.OFFSET.size
+        start, stop = struct.unpack_from("<II", self.buffer, position)
+
+        if start == stop:
+            return None
+
+        return self.buffer[self.keys_start + start:self.keys_start + stop]
 
     @staticmethod
-    def __generate__(start, stop, reverse_dictionary):
+    def fingerprint(base_range: tuple[int, int], surrogates: tuple[int, int]) -> int:
         """
-        Generate dictionary
+        Fingerprint of the alphabet a table was built for.
         """
-        d = {}
-        for i in range(start, stop):
-            try:
-                byte_value = chr(i).encode("utf-8")
-                d[byte_value] = [int(i), int(0)]
-                reverse_dictionary[int(i)] = byte_value
-            except UnicodeEncodeError:
-                # Skip characters that cannot be encoded in UTF-8
-                continue
-        logger.debug(f"Generated dictionary from {start} to {stop}: \n{list(d.items())}")
-        return d
+        return zlib.crc32(struct.pack("<IIII", *base_range, *surrogates) + b"utf-8")
+
+    @staticmethod
+    def build(base_range: tuple[int, int], surrogates: tuple[int, int]) -> bytes:
+        """
+        Build a base table.
+        """
+        offsets = [0]
+        keys = list()
+        size = 0
+
+        for i in range(*base_range):
+            key = b""
+            if not surrogates[0] <= i < surrogates[1]:
+                key = chr(i).encode("utf-8")
+                size += 1
+
+            keys.append(key)
+            offsets.append(offsets[-1] + len(key))
+
+        body = struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(keys)
+
+        header = LZWBaseTable.HEADER.pack(
+            BASE_TABLE_MAGIC,
+            BASE_TABLE_VERSION,
+            LZWBaseTable.fingerprint(base_range, surrogates),
+            len(keys),
+            size,
+            zlib.crc32(body)
+        )
+
+        return header + body
+
+
+class LZWCodeTable:
+    """
+    Code table used by the `LZW` engine.
+
+    Every learned sequence is stored as a `(prefix_code, next_byte)` pair
+    packed into a single integer key:
+        >>> {
+            (prefix_code << 8) | next_byte: code,
+            ...
+        }
+
+    Codes below `BASE_SIZE` are the single bytes themselves and are
+    never stored, so a lookup is a single dict access no matter how
+    large the table grows. `CLEAR_CODE` is reserved to tell the decoder
+    to reset its table.
+
+    The table holds at most `2 ** max_code_width` codes, once full it is
+    either reset or frozen depending on `policy`.
+
+    A table can be pre-seeded with the keys of trained sequences (see
+    `LZWTrainedDictionary`), they get the codes from `FIRST_CODE` on and
+    a reset goes back to them instead of the bare alphabet.
+    """
+    BASE_SIZE: int = 256
+    CLEAR_CODE: int = BASE_SIZE
+    FIRST_CODE: int = BASE_SIZE + 1
+
+    @METRICS.timed(STAGE_DICTIONARY_INIT)
+    def __init__(
+            self,
+            max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+            policy: int | None = RESET,
+            seed: array | list[int] | None = None
+    ) -> None:
+        if not MIN_CODE_WIDTH <= max_code_width <= MAX_CODE_WIDTH:
+            raise ValueError(
+                f"The max code width must be between {MIN_CODE_WIDTH} and {MAX_CODE_WIDTH} bits, got {max_code_width}."
+            )
+
+        if policy not in (RESET, FREEZE):
+            raise ValueError(f"Unknown table policy `{policy}`.")
+
+        self.max_code_width = max_code_width
+        self.policy = policy
+        self.limit: int = 1 << max_code_width
+
+        # The pre-seeded codes, learning starts at `start_code`
+        self.seed: dict[int, int] = dict()
+
+        for key in seed if seed is not None else ():
+            prefix_code = key >> 8
+            if prefix_code == self.CLEAR_CODE or prefix_code >= self.FIRST_CODE + len(self.seed):
+                raise ValueError(f"Invalid seed key `{key}`, its prefix isn't seeded before it.")
+
+            self.seed[key] = self.FIRST_CODE + len(self.seed)
+
+        self.start_code: int = self.FIRST_CODE + len(self.seed)
+
+        if self.start_code >= self.limit:
+            raise ValueError(
+                f"{len(self.seed)} seeded codes don't fit in {max_code_width} bits codes."
+            )
+
+        self.codes: dict[int, int] = dict(self.seed)
+        self.next_code: int = self.start_code
+
+    def __len__(self) -> int:
+        return self.next_code
+
+    def is_full(self) -> bool:
+        """
+        Is there no room left for new codes.
+        """
+        return self.next_code >= self.limit
+
+    def lookup(self, prefix_code: int, char: int) -> int | None:
+        """
+        Get the code of `prefix_code` followed by `char`.
+        """
+        return self.codes.get((prefix_code << 8) | char)
+
+    def add(self, prefix_code: int, char: int) -> int | None:
+        """
+        Add `prefix_code` followed by `char` and return its code,
+        `None` is returned when the table is full.
+        """
+        if self.is_full():
+            return None
+
+        code = self.next_code
+
+        self.codes[(prefix_code << 8) | char] = code
+        self.next_code += 1
+
+        return code
+
+    def sequences(self) -> list[bytes]:
+        """
+        Build the code -> sequence list of the table.
+        """
+        entries = [bytes([i]) for i in range(self.BASE_SIZE)]
+        entries += [b""] * (self.next_code - self.BASE_SIZE)  # `CLEAR_CODE` stays empty
+
+        for key, code in sorted(self.codes.items(), key=lambda item: item[1]):
+            entries[code] = entries[key >> 8] + bytes([key & 0xFF])
+
+        return entries
+
+    def drop(self) -> None:
+        """
+        Drop every learned sequence, the seeded ones are kept.
+        """
+        self.codes.clear()
+        self.codes.update(self.seed)
+        self.next_code = self.start_code
+
+    @staticmethod
+    def code_width(index: int, max_code_width: int, start_code: int = FIRST_CODE) -> int:
+        """
+        Get the width in bits of the `index`-th code since the start
+        of a stream or the last `CLEAR_CODE`, `start_code` is the first
+        code of a pre-seeded table.
+
+        The encoder adds one code per emitted code, so when it emits
+        the `index`-th code the largest possible code is `start_code - 1 + index`.
+        """
+        width = (start_code - 1 + index).bit_length()
+
+        return min(max_code_width, max(MIN_CODE_WIDTH, width))
+
+
+class LZWTrainedDictionary:
+    """
+    Sequences learned from sample files, they pre-seed the code table of
+    every member of an archive so small files don't start from the bare
+    alphabet. Kept as a binary file, by default under `TRAINED_DICTIONARIES_DIR`.
+
+    The dictionary's layout looks like this:
+        >>> TRAINED_DICTIONARY_MAGIC | version (u16) | id (u32) | entries (u32)
+            keys (entries x u32)
+
+    Keys are `(prefix_code << 8) | next_byte` in code order, like in
+    `LZWCodeTable`. The id is the CRC32 of the keys, archives record it
+    so they are never decoded with another dictionary.
+    """
+    HEADER: struct.Struct = struct.Struct("<6sHII")
+
+    def __init__(self, seed: array | list[int]) -> None:
+        self.seed: array = array(CODES_TYPECODE, seed)
+        self.id: int = self.identify(self.seed)
+
+    def __len__(self) -> int:
+        return len(self.seed)
+
+    @staticmethod
+    def identify(seed: array | list[int]) -> int:
+        """
+        Get the id of a dictionary from its keys, never 0 which stands
+        for no dictionary.
+        """
+        return zlib.crc32(struct.pack(f"<{len(seed)}I", *seed)) or 1
+
+    @staticmethod
+    def path(name: str) -> str:
+        """
+        Get where the dictionary `name` is saved under `TRAINED_DICTIONARIES_DIR`.
+        """
+        return os.path.join(TRAINED_DICTIONARIES_DIR, name + TRAINED_DICTIONARY_EXTENSION)
 
     @staticmethod
-    def worker(start, stop, idx, shared_results, reverse_dictionary):
-        """
-        Worker function to process dictionary generation.
-        """
-        result = LZWDictionary.__generate__(start, stop, reverse_dictionary)
-        shared_results[idx] = result  # Update shared dictionary
-
-    @measure_time
-    def __generate_dict__(self):
-        """
-        Generates the default dict.
-        """
-        processes = []
-
-        # Create a Manager to share results across processes
-        with Manager() as manager:
-            indexes = [
-                # self.ASCII,
-                # self.EXTENDED_ASCII
-                self.BASIC_UNICODE,
-                # self.FULL_UNICODE_RANGE,
-                # self.BASIC_SYMBOLS,
-                # self.EMOJIS
-            ]
-            for index in indexes:
-                self.values += [i for i in range(index[0], index[1])]
-
-            processes_n = len(indexes)
-            shared_results = manager.list([{} for _ in range(processes_n)])
-            reverse_dictionary = manager.dict()
-
-            # Create and start processes
-            for idx, (start, stop) in enumerate(indexes):
-                process = Process(
-                    target=self.worker,
-                    args=(start, stop, idx, shared_results, reverse_dictionary),
-                )
-                process.start()
-                processes.append(process)
-
-            # Wait for all processes to finish
-            for process in processes:
-                process.join()
-
-            # Merge results into the main dictionary
-            for result in shared_results:
-                self.dictionary.update(result)
-
-            self.reverse_dictionary = reverse_dictionary.copy()
-            self.INIT_DICT_SIZE = len(self.dictionary) - 1
+    def find(name: str) -> str:
+        """
+        Get the path of a dictionary from a path or the name of one saved
+        under `TRAINED_DICTIONARIES_DIR`.
+        """
+        if os.path.isfile(name):
+            return name
+
+        return LZWTrainedDictionary.path(name)
+
+    @classmethod
+    def load(cls, path: str) -> LZWTrainedDictionary:
+        """
+        Load a dictionary, raises `ValueError` if it's unsupported or corrupt.
+        """
+        with open(path, "rb") as f:
+            buffer = f.read()
+
+        if len(buffer) < cls.HEADER.size:
+            raise ValueError(f"Truncated trained dictionary `{path}`.")
+
+        magic, version, dictionary_id, entries = cls.HEADER.unpack_from(buffer, 0)
+
+        if magic != TRAINED_DICTIONARY_MAGIC or version != TRAINED_DICTIONARY_VERSION:
+            raise ValueError(f"Unsupported trained dictionary `{path}`.")
+
+        if len(buffer) != cls.HEADER.size + entries * 4:
+            raise ValueError(f"Truncated trained dictionary `{path}`.")
+
+        dictionary = cls(struct.unpack_from(f"<{entries}I", buffer, cls.HEADER.size))
+
+        if dictionary.id != dictionary_id:
+            raise ValueError(f"Corrupt trained dictionary `{path}`.")
+
+        logger.debug(f"Loaded trained dictionary `{path}` ({dictionary.id:08x}): {entries} entries")
+
+        return dictionary
+
+    def save(self, path: str) -> None:
+        """
+        Save the dictionary to `path`.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Write then rename, a dictionary in use is never left half written
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as o:
+            o.write(self.HEADER.pack(
+                TRAINED_DICTIONARY_MAGIC, TRAINED_DICTIONARY_VERSION, self.id, len(self.seed)
+            ))
+            o.write(struct.pack(f"<{len(self.seed)}I", *self.seed))
+
+        os.replace(temp_path, path)
+
+        logger.debug(f"Saved trained dictionary `{path}` ({self.id:08x})")
+
+    def table(
+            self,
+            max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+            policy: int | None = RESET
+    ) -> LZWCodeTable:
+        """
+        Get a code table pre-seeded with the dictionary.
+        """
+        return LZWCodeTable(max_code_width=max_code_width, policy=policy, seed=self.seed)
+
+    @classmethod
+    def train(
+            cls,
+            files_paths: list[str],
+            entries: int | None = DEFAULT_TRAINED_ENTRIES,
+            sample_size: int | None = DEFAULT_SAMPLE_SIZE
+    ) -> LZWTrainedDictionary:
+        """
+        Learn the sequences worth seeding from samples of `files_paths`.
+
+        The start of every file (all of it for small ones) goes through a
+        single growing table, sequences are ranked by the bytes they
+        covered (`uses x length`) and the best `entries` are kept along
+        with the prefixes they need.
+        """
+        first_code = LZWCodeTable.FIRST_CODE
+
+        if not 0 < entries < (1 << MAX_CODE_WIDTH) - first_code:
+            raise ValueError(f"A trained dictionary holds between 1 and {(1 << MAX_CODE_WIDTH) - first_code - 1} entries.")
+
+        file_sample_size = max(sample_size // max(len(files_paths), 1), MIN_FILE_SAMPLE_SIZE)
+        limit = 1 << MAX_CODE_WIDTH
+
+        codes: dict[int, int] = dict()
+        keys = array(CODES_TYPECODE, bytes(array(CODES_TYPECODE).itemsize * first_code))  # By code
+        lengths = array(CODES_TYPECODE, [1] * LZWCodeTable.BASE_SIZE + [0])
+        uses = array("Q", bytes(8 * first_code))
+
+        sampled = 0
+        for file_path in files_paths:
+            if sampled >= sample_size:
+                break
+
+            with open(file_path, "rb") as f:
+                sample = f.read(min(file_sample_size, sample_size - sampled))
+
+            sampled += len(sample)
+
+            prefix = -1
+            for char in sample:
+                if prefix < 0:
+                    prefix = char
+                    continue
+
+                key = (prefix << 8) | char
+
+                code = codes.get(key)
+                if code is not None:
+                    prefix = code
+                    continue
+
+                uses[prefix] += 1
+
+                if len(lengths) < limit:
+                    codes[key] = len(lengths)
+
+                    keys.append(key)
+                    lengths.append(lengths[prefix] + 1)
+                    uses.append(0)
+
+                prefix = char
+
+            if prefix >= 0:
+                uses[prefix] += 1
+
+        ranked = sorted(
+            (code for code in range(first_code, len(lengths)) if uses[code]),
+            key=lambda code: uses[code] * lengths[code],
+            reverse=True
+        )
+
+        chosen: set[int] = set()
+        for code in ranked:
+            chain = list()
+            while code >= first_code and code not in chosen:
+                chain.append(code)
+                code = keys[code] >> 8
+
+            if len(chosen) + len(chain) <= entries:
+                chosen.update(chain)
+
+            if len(chosen) == entries:
+                break
+
+        # Prefixes always have smaller codes, renumbering in order keeps them first
+        renumbered: dict[int, int] = dict()
+        seed = array(CODES_TYPECODE)
+
+        for code in sorted(chosen):
+            prefix_code = keys[code] >> 8
+            if prefix_code >= first_code:
+                prefix_code = renumbered[prefix_code]
+
+            renumbered[code] = first_code + len(seed)
+            seed.append((prefix_code << 8) | (keys[code] & 0xFF))
+
+        logger.debug(f"Trained a dictionary of {len(seed)} entries on {sampled} bytes")
+
+        return cls(seed)
+
+
+class LZWCompressor:
+    """
+    Incremental LZW compressor.
+
+    Keeps the current prefix and the code table between calls, so data
+    can be compressed as it arrives:
+        >>> compressor = LZWCompressor()
+        >>> codes = compressor.feed(b"hello ")
+        >>> codes += compressor.feed(b"hello")
+        >>> codes += compressor.flush()
+    """
+    def __init__(self, dictionary: LZWCodeTable | None = None) -> None:
+        if dictionary is None:
+            dictionary = LZWCodeTable()
+
+        self.dictionary = dictionary
+        self.prefix: int = -1  # No prefix yet
+        self.flushed: bool = False
+
+    @METRICS.timed(STAGE_ENCODE)
+    def feed(self, chunk: bytes | memoryview, output: array | None = None) -> array:
+        """
+        Compress a chunk and return the codes it completed, appended to
+        `output` when given.
+        """
+        if self.flushed:
+            raise ValueError("The compressor was already flushed.")
+
+        compressed_data = output if output is not None else array(CODES_TYPECODE)
+        emit = compressed_data.append
+
+        dictionary = self.dictionary
+        codes = dictionary.codes
+        next_code = dictionary.next_code
+        limit = dictionary.limit
+        reset = dictionary.policy == RESET
+        prefix = self.prefix
+
+        for char in chunk:
+            if prefix < 0:
+                prefix = char
+                continue
+
+            key = (prefix << 8) | char
+
+            code = codes.get(key)
+            if code is not None:
+                prefix = code
+            else:
+                emit(prefix)
+
+                if next_code < limit:
+                    codes[key] = next_code
+                    next_code += 1
+                elif reset:
+                    emit(LZWCodeTable.CLEAR_CODE)
+
+                    dictionary.drop()
+                    next_code = dictionary.start_code
+
+                prefix = char
+
+        dictionary.next_code = next_code
+        self.prefix = prefix
+
+        return compressed_data
+
+    @METRICS.timed(STAGE_ENCODE)
+    def flush(self, output: array | None = None) -> array:
+        """
+        Emit the pending prefix and end the stream, appended to `output`
+        when given.
+        """
+        compressed_data = output if output is not None else array(CODES_TYPECODE)
+
+        if self.flushed:
+            return compressed_data
+
+        self.flushed = True
+
+        if self.prefix >= 0:
+            compressed_data.append(self.prefix)
+
+            self.prefix = -1
+
+        return compressed_data
+
+
+class LZWDecompressor:
+    """
+    Incremental LZW decompressor.
+
+    Takes codes in batches and returns the bytes each batch decoded to,
+    so a stream never has to be held in memory as a whole:
+        >>> decompressor = LZWDecompressor()
+        >>> for codes in batches:
+        ...     output.write(decompressor.feed(codes))
+
+    Entries aren't kept as `bytes`, every entry is a link `(prefix code
+    << 8) | last byte` and a length in flat arrays, so its size doesn't
+    depend on the length of its string. The string of an entry was
+    already decoded once, when it was created, the offset where it
+    starts in the output is kept too and entries within the last
+    `WINDOW` bytes of output are copied from there. Older ones are
+    rebuilt by walking their links back.
+    """
+    WINDOW: int = 1 << 20
+
+    def __init__(self, dictionary: LZWCodeTable | None = None) -> None:
+        if dictionary is None:
+            dictionary = LZWCodeTable()
+
+        base_size = LZWCodeTable.FIRST_CODE
+
+        # The base alphabet then the CLEAR code, which is never looked up
+        self.links: array = array(CODES_TYPECODE, range(base_size))
+        self.lengths: array = array(CODES_TYPECODE, [1] * LZWCodeTable.BASE_SIZE + [0])
+        self.offsets: array = array("q", [-1] * base_size)  # -1 when not in the output
+
+        for key, _ in sorted(dictionary.codes.items(), key=lambda item: item[1]):
+            self.links.append(key)
+            self.lengths.append(self.lengths[key >> 8] + 1)
+            self.offsets.append(-1)
+
+        self.limit: int = dictionary.limit
+        self.start_code: int = dictionary.start_code  # A CLEAR code goes back to the seeded codes
+
+        # The last `WINDOW` bytes of output, `base` is the offset of its first byte
+        self.history: bytearray = bytearray()
+        self.base: int = 0
+
+        self.w: int = -1  # No previous entry at the start of the stream or after a CLEAR code
+        self.w_offset: int = 0
+
+    @METRICS.timed(STAGE_DECODE)
+    def feed(self, codes: array | Iterable[int]) -> bytes:
+        """
+        Decompress a batch of codes.
+        """
+        first_code = LZWCodeTable.FIRST_CODE
+        start_code = self.start_code
+        clear_code = LZWCodeTable.CLEAR_CODE
+
+        links = self.links
+        lengths = self.lengths
+        offsets = self.offsets
+        add_link = links.append
+        add_length = lengths.append
+        add_offset = offsets.append
+
+        history = self.history
+        emit = history.append
+        base = self.base
+
+        limit = self.limit
+        size = len(lengths)
+        w = self.w
+        w_offset = self.w_offset
+
+        feed_start = len(history)
+
+        for token in codes:
+            start = len(history)
+
+            if token < clear_code:
+                emit(token)
+
+                first = token
+            elif token < size:
+                if token == clear_code:
+                    del links[start_code:]
+                    del lengths[start_code:]
+                    del offsets[start_code:]
+
+                    size = start_code
+                    w = -1
+                    continue
+
+                position = offsets[token] - base
+
+                if position >= 0:
+                    history += history[position:position + lengths[token]]
+                else:
+                    # Out of the window, walk back until an entry that is in it
+                    length = lengths[token]
+                    history += bytes(length)
+
+                    i = start + length - 1
+                    code = token
+                    while code >= first_code and offsets[code] < base:
+                        link = links[code]
+
+                        history[i] = link & 0xFF
+                        code = link >> 8
+                        i -= 1
+
+                    if code < clear_code:
+                        history[i] = code
+                    else:
+                        position = offsets[code] - base
+                        history[start:start + lengths[code]] = history[position:position + lengths[code]]
+
+                    # It can be copied from here from now on
+                    offsets[token] = base + start
+
+                first = history[start]
+            elif token == size and w >= 0:
+                # The entry being created, `w` followed by its first byte
+                position = w_offset - base
+
+                history += history[position:position + lengths[w]]
+
+                first = history[position]
+                emit(first)
+            else:
+                raise ValueError(f"Invalid token encountered: {token = }")
+
+            if w >= 0 and size < limit:
+                add_link((w << 8) | first)
+                add_length(lengths[w] + 1)
+                add_offset(w_offset)
+
+                size += 1
+
+            w = token
+            w_offset = base + start
+
+        result = bytes(history[feed_start:])
+
+        # Keep the window, and always the last entry for the next batch
+        keep = max(self.WINDOW, len(history) - (w_offset - base))
+        if len(history) > keep:
+            trim = len(history) - keep
+
+            del history[:trim]
+            base += trim
+
+        self.base = base
+        self.w = w
+        self.w_offset = w_offset
+
+        return result
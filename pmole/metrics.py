@@ -0,0 +1,271 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__all__ = [
+    "Metrics",
+    "Histogram",
+    "METRICS",
+    "STAGE_READ",
+    "STAGE_DICTIONARY_INIT",
+    "STAGE_ENCODE",
+    "STAGE_SERIALIZE",
+    "STAGE_WRITE",
+    "STAGE_PARSE",
+    "STAGE_DECODE"
+]
+
+import os
+import sys
+import time
+import functools
+
+from threading import Lock
+from contextlib import contextmanager
+from typing import Generator
+
+# Pipeline stages
+STAGE_READ: str = "read"
+STAGE_DICTIONARY_INIT: str = "dictionary_init"
+STAGE_ENCODE: str = "encode"
+STAGE_SERIALIZE: str = "serialize"
+STAGE_WRITE: str = "write"
+STAGE_PARSE: str = "parse"
+STAGE_DECODE: str = "decode"
+
+# Stubs
+class Histogram: ...
+class Metrics: ...
+
+# Implementations
+class Histogram:
+    """
+    Distribution of the values of a metric, bucketed by powers of two.
+    """
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: int = 0
+        self.min: int | None = None
+        self.max: int | None = None
+        self.buckets: dict[int, int] = dict()
+
+    def observe(self, value: int) -> None:
+        """
+        Add a value, it lands in the bucket of values below `2 ** value.bit_length()`.
+        """
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        bucket = 1 << int(value).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, snapshot: dict) -> None:
+        """
+        Add the values of a `snapshot` of another histogram.
+        """
+        if not snapshot["count"]:
+            return
+
+        self.count += snapshot["count"]
+        self.total += snapshot["total"]
+        self.min = snapshot["min"] if self.min is None else min(self.min, snapshot["min"])
+        self.max = snapshot["max"] if self.max is None else max(self.max, snapshot["max"])
+
+        for bucket, count in snapshot["buckets"].items():
+            self.buckets[int(bucket)] = self.buckets.get(int(bucket), 0) + count
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": dict(sorted(self.buckets.items())),
+        }
+
+class Metrics:
+    """
+    Registry of the timers, counters and histograms of the pipeline.
+
+    Timers are in nanoseconds and are histograms of their own, one value
+    per timed call:
+        >>> with METRICS.timer(STAGE_ENCODE):
+        ...     codes = compressor.feed(data)
+        >>> METRICS.count("bytes_read", len(data))
+
+    Worker processes have their own registry, their `snapshot` has to be
+    sent back and `merge`d into the parent one.
+    """
+    def __init__(self) -> None:
+        self.timers: dict[str, Histogram] = dict()
+        self.histograms: dict[str, Histogram] = dict()
+        self.counters: dict[str, int] = dict()
+
+        self.lock = Lock()
+
+    @contextmanager
+    def timer(self, name: str) -> Generator[None, None, None]:
+        """
+        Time the body of a `with` block.
+        """
+        start = time.perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter_ns() - start)
+
+    def timed(self, name: str) -> callable:
+        """
+        Decorator timing every call of a function or a method.
+        """
+        def decorator(func: callable) -> callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add_time(name, time.perf_counter_ns() - start)
+
+            return wrapper
+
+        return decorator
+
+    def add_time(self, name: str, elapsed: int) -> None:
+        """
+        Record a call of `elapsed` nanoseconds to a timer.
+        """
+        with self.lock:
+            self.timers.setdefault(name, Histogram()).observe(elapsed)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter.
+        """
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: int) -> None:
+        """
+        Add a value to a histogram.
+        """
+        with self.lock:
+            self.histograms.setdefault(name, Histogram()).observe(value)
+
+    def snapshot(self) -> dict:
+        """
+        Plain data copy of the registry, can be pickled or dumped as JSON.
+        """
+        with self.lock:
+            return {
+                "timers": {name: timer.snapshot() for name, timer in self.timers.items()},
+                "histograms": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        """
+        Add a `snapshot` of another registry, usually a worker's one.
+        """
+        with self.lock:
+            for name, timer in snapshot["timers"].items():
+                self.timers.setdefault(name, Histogram()).merge(timer)
+
+            for name, histogram in snapshot["histograms"].items():
+                self.histograms.setdefault(name, Histogram()).merge(histogram)
+
+            for name, value in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self.lock:
+            self.timers.clear()
+            self.histograms.clear()
+            self.counters.clear()
+
+    def reset_lock(self) -> None:
+        """
+        Replace the lock in a forked child, a thread of the parent could
+        hold it at the fork and leave it locked for good.
+        """
+        self.lock = Lock()
+
+    def report(self, elapsed: int, input_bytes: int, output_bytes: int) -> dict:
+        """
+        Summary of a run of `elapsed` nanoseconds: the totals of every
+        stage, the throughput and the peak memory of the process and its
+        workers.
+
+        Stages that ran on workers add up the time of every worker, so
+        their totals can be larger than the wall time.
+        """
+        snapshot = self.snapshot()
+        seconds = elapsed / 1e9
+
+        return {
+            "elapsed_ns": elapsed,
+            "input_bytes": input_bytes,
+            "output_bytes": output_bytes,
+            "input_bytes_per_second": input_bytes / seconds if seconds else None,
+            "output_bytes_per_second": output_bytes / seconds if seconds else None,
+            "peak_memory_bytes": self.peak_memory(),
+            "stages": {
+                name: {
+                    "calls": timer["count"],
+                    "total_ns": timer["total"],
+                    "min_ns": timer["min"],
+                    "max_ns": timer["max"],
+                    "histogram_ns": timer["buckets"],
+                }
+                for name, timer in sorted(snapshot["timers"].items())
+            },
+            "histograms": snapshot["histograms"],
+            "counters": snapshot["counters"],
+        }
+
+    @staticmethod
+    def peak_memory() -> dict[str, int] | None:
+        """
+        Peak resident memory in bytes of the process and of its largest
+        finished worker, `None` where it can't be measured.
+        """
+        try:
+            import resource
+        except ImportError:
+            return None  # Windows
+
+        # ru_maxrss is in kilobytes on linux and in bytes on macOS
+        unit = 1 if sys.platform == "darwin" else 1024
+
+        return {
+            "process": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+            "workers": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit,
+        }
+
+# The registry of the current process
+METRICS: Metrics = Metrics()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=METRICS.reset_lock)
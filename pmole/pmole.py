@@ -24,25 +24,71 @@ __all__ = [
     "Pmole"
 ]
 
+import io
+import zlib
+
+from array import array
+from typing import BinaryIO, Generator, Iterable
+from queue import Queue
+from threading import Thread
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from loguru import logger
+from pmole.log import logger
 
 from pmole.convert import Convert
 
-from pmole.file_handler import FileHandler
+# Container
+from pmole.container import Container
+from pmole.container import Member
+from pmole.container import FORMAT_BINARY
+from pmole.container import FORMAT_TEXT
+from pmole.container import PM_MAGIC
+from pmole.container import TEXT_HEADER
+from pmole.container import BLOCK_STORED
+from pmole.container import CODING_NONE
 
 # Algos
 from pmole.lzw import LZW
+from pmole.lzw import LZWCodeTable
+from pmole.lzw import LZWCompressor
+from pmole.lzw import LZWDecompressor
+from pmole.lzw import LZWTrainedDictionary
 from pmole.lzw import LZWDictionary
+from pmole.lzw import RESET
+from pmole.lzw import FREEZE
+from pmole.lzw import MAX_CODE_WIDTH
+from pmole.lzw import DEFAULT_MAX_CODE_WIDTH
+from pmole.lzw import CODES_TYPECODE
 
 # File handler
 from pmole.file_handler import FileHandler
-from pmole.file_handler import BY_LINE
+from pmole.file_handler import BY_MMAP
+
+# Metrics
+from pmole.metrics import METRICS
+from pmole.metrics import STAGE_SERIALIZE
+from pmole.metrics import STAGE_WRITE
 
 # Utils
-from pmole.utils import Nodes
-from pmole.utils import measure_time
 from pmole.utils import list_files_in_directory
+from pmole.utils import split_data_to_blocks
+from pmole.utils import crc32_combine
+
+# Members past this size (in bytes) are never decoded as a whole in memory
+STREAM_MEMBER_SIZE: int = 64 << 20
+
+# Bytes of a block compressed first to tell whether LZW makes it smaller
+STORED_SAMPLE_SIZE: int = 1 << 16
+
+# Chunks stored blocks are read in when decoding
+STORED_READ_SIZE: int = 1 << 20
+
+# Writer item telling to decode a member straight from the archive
+STREAM: object = object()
+
+# Writer item telling to copy a link from the file of the member it points to
+COPY: object = object()
 
 class Pmole:
     """
@@ -52,174 +98,1004 @@ class Pmole:
     def __init__(self) -> None:
         self.convert = Convert()
         self.lzw = LZW()
+        self.container = Container()
     
-    @measure_time
-    def compress(self, file_path: str | None = None, directory_path: str | None = None, threads: int | None = 7) -> None:
+    @METRICS.timed("compress")
+    def compress(
+        self,
+        file_path: str | None = None,
+        directory_path: str | None = None,
+        threads: int | None = 7,
+        archive_format: str | None = FORMAT_BINARY,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        block_size: int | None = 0,
+        dictionary_path: str | None = None,
+        coding: int | None = CODING_NONE
+    ) -> None:
         """
         Compress a file or a directory.
+
+        Every file gets its own code table of at most `2 ** max_code_width`
+        codes, `policy` tells what to do once it is full. With a `block_size`
+        files are split into independent blocks compressed in parallel.
+
+        Identical files are only compressed once, in binary archives the
+        others are links to the first one. Blocks LZW doesn't make smaller
+        (already compressed data) are stored as they are. With the trained
+        dictionary at `dictionary_path` every code table is pre-seeded with it.
+        With an entropy `coding` the codes of binary archives go through a
+        second stage (see `Container.pack_block`).
         """
-        files: list[FileHandler] = list()
+        if archive_format == FORMAT_TEXT and policy == FREEZE:
+            # The text format doesn't record the table settings, a frozen
+            # table can't be rebuilt without knowing where it stopped.
+            raise ValueError("The text format only supports the reset policy.")
+
+        if archive_format == FORMAT_TEXT and coding != CODING_NONE:
+            raise ValueError("The text format doesn't support entropy coding.")
+
+        dictionary: LZWTrainedDictionary | None = None
+
+        if dictionary_path is not None:
+            if archive_format == FORMAT_TEXT:
+                raise ValueError("The text format doesn't support trained dictionaries.")
+
+            dictionary = LZWTrainedDictionary.load(dictionary_path)
+            dictionary.table(max_code_width=max_code_width, policy=policy)  # Fail now if it doesn't fit
+
         files_paths: list[str] = list()
         
         if directory_path is not None:
-            files_paths = list_files_in_directory(
+            # Sorted so the same directory always gives the same archive
+            files_paths = sorted(list_files_in_directory(
                 directory=directory_path
-            )
+            ))
             
             logger.info(f"Found {len(files_paths)} files.")
-
-            files = [FileHandler(file_path) for file_path in files_paths]
         else:
-            files = [FileHandler(file_path), ]
             files_paths = [file_path, ]
 
-        file_structure = self.generate_file_structure(
-            files_paths=[file_path for file_path in files_paths]
+        if directory_path is not None:
+            output_file_name = Path(directory_path).name + ".pm"
+        else:
+            output_file_name = Path(file_path).name.split(".")[0] + ".pm"
+
+        sources: list[int] | None = None
+        unique_files_paths = files_paths
+
+        if archive_format != FORMAT_TEXT:
+            sources = self.find_duplicates(files_paths, threads)
+            unique_files_paths = [
+                file_path for i, file_path in enumerate(files_paths) if sources[i] == i
+            ]
+
+            if len(unique_files_paths) < len(files_paths):
+                logger.info(f"Found {len(files_paths) - len(unique_files_paths)} duplicate files.")
+
+        # Members are written as soon as they are compressed, the
+        # archive is never held in memory as a whole.
+        compressed_files = self.iter_compressed_files(
+            files_paths=unique_files_paths,
+            threads=threads,
+            max_code_width=max_code_width,
+            policy=policy,
+            block_size=block_size,
+            pack=archive_format != FORMAT_TEXT,
+            seed=dictionary.seed if dictionary is not None else None,
+            coding=coding
         )
 
-        output_data: list[list[int]] = list()
-        
-        for file in files:
-            dictionary: LZWDictionary = LZWDictionary()
-            dictionary.create()
-        
-            logger.info(f"Compressing file `{file.file_path}`...")
+        try:
+            with FileHandler(output_file_name).writer() as output:
+                if archive_format == FORMAT_TEXT:
+                    self.write_text_archive(output, files_paths, compressed_files)
+                else:
+                    self.write_container(
+                        output,
+                        files_paths,
+                        compressed_files,
+                        sources=sources,
+                        max_code_width=max_code_width,
+                        policy=policy,
+                        block_size=block_size,
+                        dictionary=dictionary,
+                        coding=coding
+                    )
+
+                METRICS.count("bytes_written", output.tell())
+        except BaseException:
+            compressed_files.close()  # Cancel the pending jobs
+
+            Path(output_file_name).unlink(missing_ok=True)
+            raise
+
+        logger.info(f"Compressing is done. output file is `{output_file_name}`.")
+
+    def find_duplicates(self, files_paths: list[str], threads: int | None = 7) -> list[int]:
+        """
+        Find the files with the same content, returns the index of the
+        first file with the same content as each file (its own index
+        when it is the first).
+
+        Only files sharing their size with another one are hashed, on a
+        pool of `threads` threads (hashing releases the GIL).
+        """
+        sizes = [Path(file_path).stat().st_size for file_path in files_paths]
 
-            file_buffer = file.read(threads)
-            compressed_data = self.lzw.compress(
-                data=file_buffer,
-                dictionary=dictionary
+        same_size: dict[int, list[int]] = dict()
+        for i, size in enumerate(sizes):
+            same_size.setdefault(size, list()).append(i)
+
+        candidates = sorted(i for group in same_size.values() if len(group) > 1 for i in group)
+
+        sources = list(range(len(files_paths)))
+        if not candidates:
+            return sources
+
+        with ThreadPoolExecutor(max_workers=max(min(threads, len(candidates)), 1)) as executor:
+            digests = executor.map(lambda i: FileHandler(files_paths[i]).digest(), candidates)
+
+            first: dict[tuple[int, bytes], int] = dict()
+            for i, digest in zip(candidates, digests):
+                sources[i] = first.setdefault((sizes[i], digest), i)
+
+        return sources
+
+    def iter_compressed_files(
+        self,
+        files_paths: list[str],
+        threads: int | None = 7,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        block_size: int | None = 0,
+        pack: bool | None = False,
+        seed: array | None = None,
+        coding: int | None = CODING_NONE
+    ) -> Generator[tuple[int, list], None, None]:
+        """
+        Compress files on a pool of `threads` processes, yields the
+        `(index, blocks)` of each file in `files_paths` order as soon as
+        all of its blocks are done.
+
+        Every file is split into independent blocks of `block_size` bytes
+        (a single block when it's 0). Blocks are handed out in archive
+        order, at most `2 * threads` ahead of the one the caller waits
+        for, so finished blocks never pile up in memory. With `pack` the
+        blocks are `(codes count, payload)` packed by the workers instead
+        of lists of codes, which are several times larger, and entropy
+        coded with `coding`. `seed` holds the keys of a trained dictionary
+        to pre-seed the code tables with.
+        """
+        compress_block = Pmole.compress_file_packed if pack else Pmole.compress_file
+
+        # The arguments after the block range
+        options: tuple = (seed, coding) if pack else (seed, )
+
+        files_blocks: list[list[tuple[int, int]]] = [
+            split_data_to_blocks(
+                data_n=Path(file_path).stat().st_size,
+                block_size=block_size
             )
-            
-            output_data.append(compressed_data)
-        
-        if len(files_paths) > 1:
-            output_file_name = Path(directory_path).name + ".pm"
+            for file_path in files_paths
+        ]
+
+        jobs: list[tuple[int, int, int]] = [
+            (i, start, stop)
+            for i, blocks in enumerate(files_blocks)
+            for start, stop in blocks
+        ]
+
+        if threads <= 1 or len(jobs) <= 1:
+            for i, blocks in enumerate(files_blocks):
+                yield (i, [
+                    compress_block(files_paths[i], threads, max_code_width, policy, start, stop, *options)
+                    for start, stop in blocks
+                ])
+
+            return
+
+        window = threads * 2
+
+        with ProcessPoolExecutor(max_workers=min(threads, len(jobs))) as executor:
+            pending: deque = deque()
+            blocks: list = list()
+
+            try:
+                for n, (i, start, stop) in enumerate(jobs):
+                    pending.append((i, executor.submit(
+                        Pmole.run_job,
+                        compress_block,
+                        files_paths[i],
+                        threads,
+                        max_code_width,
+                        policy,
+                        start,
+                        stop,
+                        *options
+                    )))
+
+                    # Jobs are in archive order, the oldest one is the next block
+                    while len(pending) > window or (pending and n == len(jobs) - 1):
+                        i, future = pending.popleft()
+                        blocks.append(self.job_result(future))
+
+                        if len(blocks) == len(files_blocks[i]):
+                            yield (i, blocks)
+
+                            blocks = list()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def compress_file(
+        file_path: str,
+        threads: int | None = 7,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        start: int | None = 0,
+        stop: int | None = None,
+        seed: array | None = None
+    ) -> array:
+        """
+        Compress a file, or the `start:stop` block of it, runs in the
+        workers of `iter_compressed_files`.
+        """
+        dictionary: LZWCodeTable = LZWCodeTable(
+            max_code_width=max_code_width,
+            policy=policy,
+            seed=seed
+        )
+
+        if start == 0:
+            logger.info(f"Compressing file `{file_path}`...")
         else:
-            output_file_name = Path(file_path).name.split(".")[0] + ".pm"
-        
-        logger.info("Constructing compress output file's data...")
+            logger.debug(f"Compressing block `{start}:{stop}` of file `{file_path}`...")
 
-        output_data = self.output_file_data(
-            file_structure=file_structure,
-            compressed_data=output_data
+        return LZW().compress(
+            data=FileHandler(file_path).read(threads, mode=BY_MMAP, start=start, stop=stop),
+            dictionary=dictionary
         )
-        
-        output_file = FileHandler(output_file_name)
-        output_file.write(
-            output_data
+
+    @staticmethod
+    def compress_file_packed(
+        file_path: str,
+        threads: int | None = 7,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        start: int | None = 0,
+        stop: int | None = None,
+        seed: array | None = None,
+        coding: int | None = CODING_NONE
+    ) -> tuple[int, bytes | None, int]:
+        """
+        Compress a file, or the `start:stop` block of it, and pack its
+        codes with the entropy `coding`. Returns the codes count, the
+        payload and the CRC32 of the data, computed while it is read.
+
+        Blocks LZW doesn't make smaller are stored as they are, which
+        gives `(BLOCK_STORED, None, checksum)`. Their first `STORED_SAMPLE_SIZE`
+        bytes are compressed first, if the codes already take as much
+        room as the sample the rest isn't compressed at all.
+        """
+        container = Container()
+
+        dictionary: LZWCodeTable = LZWCodeTable(
+            max_code_width=max_code_width,
+            policy=policy,
+            seed=seed
         )
+        compressor = LZWCompressor(dictionary=dictionary)
 
-        logger.info(f"Compressing is done. output file is `{output_file_name}`.")
+        if start == 0:
+            logger.info(f"Compressing file `{file_path}`...")
+        else:
+            logger.debug(f"Compressing block `{start}:{stop}` of file `{file_path}`...")
+
+        codes = array(CODES_TYPECODE)
+        size = 0
+        checksum = 0
+
+        for buffer in FileHandler(file_path).read(threads, mode=BY_MMAP, start=start, stop=stop):
+            size += len(buffer)
+            checksum = zlib.crc32(buffer, checksum)
+
+            with buffer[:STORED_SAMPLE_SIZE] as sample:
+                compressor.feed(sample, output=codes)
+
+                sampled = len(sample)
+
+            if sampled < len(buffer):
+                if container.packed_size(codes, max_code_width, dictionary.start_code) >= sampled:
+                    logger.debug(f"Storing block `{start}:{stop}` of file `{file_path}`, it doesn't compress.")
+
+                    return (BLOCK_STORED, None, checksum)
 
-    def decompress(self, file_path: str, threads: int | None = 3) -> None:    
+                with buffer[sampled:] as rest:
+                    compressor.feed(rest, output=codes)
+
+        compressor.flush(output=codes)
+
+        payload = container.pack_block(codes, max_code_width, dictionary.start_code, coding)
+
+        if len(payload) >= size > 0:
+            logger.debug(f"Storing block `{start}:{stop}` of file `{file_path}`, it doesn't compress.")
+
+            return (BLOCK_STORED, None, checksum)
+
+        return (len(codes), payload, checksum)
+
+    @staticmethod
+    def run_job(func: callable, *args) -> tuple[object, dict]:
         """
-        Decompress data
+        Run a job on a worker, returns its result along with the metrics
+        it recorded so they can be merged into the parent's registry.
         """
-        file = FileHandler(file_path=file_path)
-        files_paths: list[str] = list()
-        files: list[FileHandler] = list()
-        file_h: FileHandler | None = None
+        METRICS.reset()
 
-        constructed_file_path = ""
-        constructed_compressed_file_data = list()
+        return (func(*args), METRICS.snapshot())
 
-        for buffer in file.read(threads=threads, mode=BY_LINE):
-            buffer = buffer.strip()
-            logger.debug(f"Current buffer: {buffer}")
+    def job_result(self, job: Future) -> object:
+        """
+        Wait for a `run_job` job and merge its metrics.
+        """
+        result, metrics = job.result()
 
-            if buffer[0:2] == b"::":
-                constructed_file_path = buffer.replace(b":: ", b"").strip()
-                
-                logger.debug(f"Found file path `{constructed_file_path}`")
+        METRICS.merge(metrics)
 
-                files_paths.append(
-                    constructed_file_path
-                )
-                file_h = FileHandler(file_path=constructed_file_path.decode("utf-8"))
-                files.append(
-                    file_h
-                )
-                constructed_file_path = ""
-            
-            if buffer[0:2] == b"--":
-                for i in buffer.split(b" "):
-                    if i == b"idx":
-                        continue
-                    
-                    if i == b"--":
+        return result
+
+    @staticmethod
+    def join_blocks(blocks: list[array]) -> array:
+        """
+        Join the codes of independent blocks into a single stream.
+        """
+        codes = array(CODES_TYPECODE)
+
+        for j, block in enumerate(blocks):
+            if j > 0:
+                codes.append(LZWCodeTable.CLEAR_CODE)
+
+            codes.extend(block)
+
+        return codes
+
+    @staticmethod
+    def decompress_block(
+        payload: bytes,
+        codes_n: int,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        seed: array | None = None,
+        coding: int | None = CODING_NONE
+    ) -> bytes:
+        """
+        Decompress a block of a container member, runs in the workers of
+        `decompress_container`. A stored block is its own data.
+        """
+        if codes_n == BLOCK_STORED:
+            return payload
+
+        dictionary = LZWCodeTable(max_code_width=max_code_width, policy=policy, seed=seed)
+        codes = Container().unpack_block(payload, codes_n, max_code_width, dictionary.start_code, coding)
+
+        return LZWDecompressor(dictionary=dictionary).feed(codes)
+
+    @staticmethod
+    def decompress_block_at(
+        file_path: str,
+        offset: int,
+        payload_size: int,
+        codes_n: int,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        seed: array | None = None,
+        coding: int | None = CODING_NONE
+    ) -> bytes:
+        """
+        Read a block's payload from the archive and decompress it.
+        """
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            payload = f.read(payload_size)
+
+        return Pmole.decompress_block(payload, codes_n, max_code_width, policy, seed, coding)
+
+    @METRICS.timed("decompress")
+    def decompress(
+        self, file_path: str, threads: int | None = 3, dictionary_path: str | None = None
+    ) -> None:
+        """
+        Decompress data, archives compressed with a trained dictionary need
+        it at `dictionary_path`.
+        """
+        with open(file_path, "rb") as f:
+            header = f.read(max(len(PM_MAGIC), len(TEXT_HEADER)))
+
+        if Container.is_container(header):
+            self.decompress_container(file_path=file_path, threads=threads, dictionary_path=dictionary_path)
+            return
+
+        if dictionary_path is not None:
+            raise ValueError("The text format doesn't support trained dictionaries.")
+
+        is_legacy = not Container.is_text_archive(header)
+
+        with open(file_path, "rb") as f:
+            for path, batches in self.container.read_text_members(f):
+                logger.info(f"Decompressing file `{path}`...")
+
+                with FileHandler(file_path=path).writer() as output:
+                    codes = next(batches, None)
+                    if codes is None:
                         continue
 
-                    if i == b"[EOF]":
-                        logger.info(f"Decompressing file `{files[-1].file_path}`...")
+                    if is_legacy:
+                        # Written with the unicode alphabet of the first
+                        # versions, it learns codes from 63488 on right away.
+                        for batch in batches:
+                            codes += batch
 
-                        decompressed_file_data = self.lzw.decompress(
-                            compressed_data=constructed_compressed_file_data
-                        )
-                        logger.debug(f"Decompressed file data: \n{decompressed_file_data}")
-                        
-                        file_h.write(
-                            data=decompressed_file_data
+                        self.write_output(
+                            output, self.lzw.decompress(compressed_data=codes, dictionary=LZWDictionary())
                         )
+                        continue
+
+                    # CLEAR codes are self-describing, the widest table
+                    # decodes any reset-policy stream.
+                    decompressor = LZWDecompressor(
+                        dictionary=LZWCodeTable(max_code_width=MAX_CODE_WIDTH)
+                    )
+
+                    self.write_output(output, decompressor.feed(codes))
+
+                    for codes in batches:
+                        self.write_output(output, decompressor.feed(codes))
+
+    def decompress_container(
+        self, file_path: str, threads: int | None = 3, dictionary_path: str | None = None
+    ) -> None:
+        """
+        Decompress a binary .pm container.
+
+        With a single thread members are decoded batch by batch and written
+        as they go. Otherwise the member headers are scanned first, every
+        block is decoded on a pool of `threads` processes and a writer
+        thread writes the results to disk in archive order.
+        """
+        seed = self.archive_seed(file_path, dictionary_path)
+
+        # Links are copied from the file of the member they point to
+        # once it is written, that member always comes first.
+        written: dict[int, str] = dict()
+
+        if threads <= 1:
+            with open(file_path, "rb") as f:
+                for member, _ in self.container.read_members(f):
+                    if member.link in written:
+                        logger.info(f"Copying file `{written[member.link]}` to `{member.path}`...")
+
+                        self.copy_member(member, written[member.link])
+                        continue
+
+                    logger.info(f"Decompressing file `{member.path}`...")
+
+                    self.write_member(member, self.decode_member(f, member, seed))
+
+                    written[member.offset] = member.path
+
+            return
+
+        with open(file_path, "rb") as f:
+            members = [member for member, _ in self.container.read_members(f)]
+
+        window = threads * 2
+
+        results: Queue = Queue(maxsize=window)
+        errors: list[Exception] = list()
+
+        writer = Thread(target=self.write_members, args=(file_path, results, errors, seed))
+
+        try:
+            with ProcessPoolExecutor(max_workers=threads) as executor:
+                writer.start()
+
+                pending: deque = deque()
+
+                for member in members:
+                    if errors:
+                        break
+
+                    if member.link in written:
+                        logger.info(f"Copying file `{written[member.link]}` to `{member.path}`...")
 
-                        constructed_compressed_file_data.clear()
-                        file_h = None
+                        pending.append((member, COPY))
+                        continue
+
+                    logger.info(f"Decompressing file `{member.path}`...")
+
+                    written[member.offset] = member.path
+
+                    # Don't hold a whole oversized member in memory, the
+                    # writer streams it from the archive instead.
+                    if len(member.blocks) == 1 and member.uncompressed_size > STREAM_MEMBER_SIZE:
+                        pending.append((member, STREAM))
                     else:
-                        logger.debug(f"Adding token `{i}` to `constructed_compressed_file_data`")
-                        constructed_compressed_file_data.append(int(i))
+                        offset = member.payload_offset
+
+                        for codes_n, payload_size in member.blocks:
+                            pending.append((member, executor.submit(
+                                Pmole.run_job,
+                                Pmole.decompress_block_at,
+                                file_path,
+                                offset,
+                                payload_size,
+                                codes_n,
+                                member.max_code_width,
+                                member.policy,
+                                seed,
+                                member.coding
+                            )))
+                            offset += payload_size
+
+                            while len(pending) > window:
+                                self.forward_result(pending, results)
+
+                        pending.append((member, None))  # End of the member
+
+                    while len(pending) > window:
+                        self.forward_result(pending, results)
+
+                while pending and not errors:
+                    self.forward_result(pending, results)
 
-    def generate_file_structure(self, files_paths: str, directory_path: str | None = None) -> Nodes:
+                for _, job in pending:
+                    if isinstance(job, Future):
+                        job.cancel()
+        finally:
+            if writer.ident is not None:
+                results.put(None)
+                writer.join()
+
+        if errors:
+            raise errors[0]
+
+    def extract(
+        self,
+        file_path: str,
+        member_path: str,
+        threads: int | None = 3,
+        dictionary_path: str | None = None
+    ) -> None:
         """
-        Generate the .pm file structure.
+        Decompress a single member of a binary .pm container.
+
+        The index at the end of the container points straight at the
+        member, blocks of a member compressed with a `block_size` are
+        decoded on a pool of `threads` processes.
         """
-        root_node = Nodes(prev=None)
+        seed = self.archive_seed(file_path, dictionary_path)
 
-        root_node_data = []
-        for file_path in files_paths:
-            root_node_data.append(f":: {file_path}\n")
-         
-        root_node.data = root_node_data
+        with open(file_path, "rb") as f:
+            member = self.container.find_member(f, member_path)
 
-        data_node = Nodes(prev=root_node)
-        
-        root_node.next = data_node
-        
-        data_node.data = str()
+            logger.info(f"Extracting file `{member.path}`...")
 
-        return root_node
-    
-    def output_file_data(self, file_structure: Nodes, compressed_data: list[list[int]], threads_n: int | None = 7) -> bytes:
+            if threads <= 1 or len(member.blocks) == 1:
+                self.write_member(member, self.decode_member(f, member, seed))
+                return
+
+        self.write_member(member, self.decode_blocks(file_path, member, threads, seed))
+
+    def read_range(
+        self,
+        file_path: str,
+        member_path: str,
+        offset: int,
+        length: int,
+        dictionary_path: str | None = None
+    ) -> bytes:
         """
-        Convert the file structure into a file's data.
+        Read `length` bytes of a member of a binary .pm container starting
+        at the uncompressed `offset`.
+
+        Decoding starts from the checkpoint (block) holding `offset` and
+        stops as soon as the range is covered, so members compressed with
+        a `block_size` are only decoded around the range.
         """
-        output_data = []
+        if offset < 0 or length < 0:
+            raise ValueError("The range offset and length must be positive.")
+
+        seed = self.archive_seed(file_path, dictionary_path)
+
+        output = bytearray()
+
+        with open(file_path, "rb") as f:
+            member = self.container.find_member(f, member_path)
+
+            stop = min(offset + length, member.uncompressed_size)
+            if offset >= stop:
+                return bytes()
+
+            index, position, block_offset = member.checkpoint(offset)
+
+            for codes_n, payload_size in member.blocks[index:]:
+                f.seek(block_offset)
+                block_offset += payload_size
+
+                if codes_n == BLOCK_STORED:
+                    # Read straight from the range
+                    skip = max(offset - position, 0)
+                    size = min(stop - position, payload_size) - skip
+
+                    f.seek(skip, io.SEEK_CUR)
+
+                    data = f.read(size)
+                    if len(data) != size:
+                        raise ValueError(f"Truncated member `{member.path}`.")
+
+                    output += data
+                    position += payload_size
+
+                    if position >= stop:
+                        return bytes(output)
+
+                    continue
+
+                decompressor = LZWDecompressor(
+                    dictionary=LZWCodeTable(
+                        max_code_width=member.max_code_width,
+                        policy=member.policy,
+                        seed=seed
+                    )
+                )
+
+                for codes in self.container.iter_block_codes(
+                    f, codes_n, payload_size, member.max_code_width, path=member.path,
+                    start_code=member.start_code, coding=member.coding
+                ):
+                    data = decompressor.feed(codes)
+
+                    if position + len(data) > offset:
+                        output += data[max(offset - position, 0):stop - position]
+
+                    position += len(data)
+
+                    if position >= stop:
+                        return bytes(output)
+
+        raise ValueError(f"Corrupted member `{member.path}`: shorter than its recorded size.")
+
+    def decode_blocks(
+        self, file_path: str, member: Member, threads: int | None = 3, seed: array | None = None
+    ) -> Generator[bytes, None, None]:
+        """
+        Decode the blocks of a member on a pool of `threads` processes,
+        yields them in order.
+        """
+        window = threads * 2
+
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            pending: deque = deque()
+            offset = member.payload_offset
+
+            for codes_n, payload_size in member.blocks:
+                pending.append(executor.submit(
+                    Pmole.run_job,
+                    Pmole.decompress_block_at,
+                    file_path,
+                    offset,
+                    payload_size,
+                    codes_n,
+                    member.max_code_width,
+                    member.policy,
+                    seed,
+                    member.coding
+                ))
+                offset += payload_size
+
+                if len(pending) > window:
+                    yield self.job_result(pending.popleft())
+
+            while pending:
+                yield self.job_result(pending.popleft())
+
+    def forward_result(self, pending: deque, results: Queue) -> None:
+        """
+        Hand the oldest pending job of `decompress_container` to the writer.
+        """
+        member, job = pending.popleft()
+
+        if isinstance(job, Future):
+            job = self.job_result(job)
+
+        results.put((member, job))
+
+    def write_members(
+        self, file_path: str, results: Queue, errors: list[Exception], seed: array | None = None
+    ) -> None:
+        """
+        Writer stage of `decompress_container`.
+
+        Takes `(member, data)` items in archive order: decoded blocks,
+        `None` once a member is complete, `STREAM` for a member to
+        decode straight from the archive or `COPY` for a link to copy.
+        Stops at a `None` item.
+        """
+        output: BinaryIO | None = None
+        decompressed_size = 0
+
+        # Where the members links can point to were written
+        written: dict[int, str] = dict()
+
+        with open(file_path, "rb") as f:
+            while (item := results.get()) is not None:
+                member, data = item
+
+                if errors:
+                    continue  # Keep draining so the producer never blocks
+
+                try:
+                    if data is COPY:
+                        self.copy_member(member, written[member.link])
+                        continue
+
+                    if output is None:
+                        output = FileHandler(file_path=member.path).writer()
+                        decompressed_size = 0
+
+                    if data is STREAM:
+                        f.seek(member.payload_offset)
+
+                        for decompressed_file_data in self.decode_member(f, member, seed):
+                            decompressed_size += len(decompressed_file_data)
+
+                            self.write_output(output, decompressed_file_data)
+                    elif data is not None:
+                        decompressed_size += len(data)
+
+                        self.write_output(output, data)
+
+                    if data is None or data is STREAM:
+                        output.close()
+                        output = None
+
+                        self.check_member_size(member, decompressed_size)
+
+                        written[member.offset] = member.path
+                except Exception as error:
+                    errors.append(error)
+
+        if output is not None:
+            output.close()
+
+    def decode_member(
+        self, f: BinaryIO, member: Member, seed: array | None = None
+    ) -> Generator[bytes, None, None]:
+        """
+        Decode a member from `f`, which is at the start of its payload.
+        Stored blocks are read as they are.
+        """
+        block_offset = f.tell()
+
+        for codes_n, payload_size in member.blocks:
+            f.seek(block_offset)
+            block_offset += payload_size
+
+            if codes_n == BLOCK_STORED:
+                yield from self.container.iter_stored_block(f, payload_size, STORED_READ_SIZE, path=member.path)
+                continue
+
+            decompressor = LZWDecompressor(
+                dictionary=LZWCodeTable(
+                    max_code_width=member.max_code_width,
+                    policy=member.policy,
+                    seed=seed
+                )
+            )
+
+            for codes in self.container.iter_block_codes(
+                f, codes_n, payload_size, member.max_code_width, path=member.path,
+                start_code=member.start_code, coding=member.coding
+            ):
+                yield decompressor.feed(codes)
+
+    def write_member(self, member: Member, decompressed_data: Iterable[bytes]) -> None:
+        """
+        Write the decoded data of a member, checking it against its
+        checksum when it is known.
+        """
+        decompressed_size = 0
+        checksum = 0
+
+        with FileHandler(file_path=member.path).writer() as output:
+            for decompressed_file_data in decompressed_data:
+                decompressed_size += len(decompressed_file_data)
+
+                if member.checksum is not None:
+                    checksum = zlib.crc32(decompressed_file_data, checksum)
+
+                self.write_output(output, decompressed_file_data)
+
+        self.check_member_size(member, decompressed_size)
+
+        if member.checksum is not None and checksum != member.checksum:
+            raise ValueError(f"Corrupted member `{member.path}`: checksum mismatch.")
+
+    def archive_seed(self, file_path: str, dictionary_path: str | None = None) -> array | None:
+        """
+        Load the trained dictionary a binary .pm container was compressed
+        with, fails before anything is decoded if it isn't the right one.
+        Returns its keys to pre-seed the code tables with.
+        """
+        with open(file_path, "rb") as f:
+            _, dictionary_id, _ = self.container.read_header(f)
+
+        if dictionary_path is None:
+            if dictionary_id != 0:
+                raise ValueError(
+                    f"The archive was compressed with the trained dictionary `{dictionary_id:08x}`, "
+                    f"it is needed to decompress it."
+                )
+
+            return None
+
+        dictionary = LZWTrainedDictionary.load(dictionary_path)
+
+        if dictionary.id != dictionary_id:
+            expected = f"`{dictionary_id:08x}`" if dictionary_id != 0 else "no dictionary"
+            raise ValueError(
+                f"Trained dictionary mismatch: the archive needs {expected}, got `{dictionary.id:08x}`."
+            )
+
+        return dictionary.seed
+
+    def copy_member(self, member: Member, source_path: str) -> None:
+        """
+        Write a link by copying the already decoded file of the member
+        it points to.
+        """
+        self.check_member_size(member, FileHandler(file_path=member.path).copy(source_path))
+
+    def write_output(self, output: BinaryIO, data: bytes) -> None:
+        """
+        Write decompressed data to an output file.
+        """
+        with METRICS.timer(STAGE_WRITE):
+            output.write(data)
+
+        METRICS.count("bytes_written", len(data))
+
+    def check_member_size(self, member: Member, decompressed_size: int) -> None:
+        """
+        Make sure a member decoded to its recorded size.
+        """
+        if decompressed_size != member.uncompressed_size:
+            raise ValueError(
+                f"Corrupted member `{member.path}`: expected {member.uncompressed_size} bytes, "
+                f"got {decompressed_size}."
+            )
+
+    def write_container(
+        self,
+        output: BinaryIO,
+        files_paths: list[str],
+        compressed_files: Iterable[tuple[int, list[tuple[int, bytes | None, int | None]]]],
+        sources: list[int] | None = None,
+        max_code_width: int | None = DEFAULT_MAX_CODE_WIDTH,
+        policy: int | None = RESET,
+        block_size: int | None = 0,
+        dictionary: LZWTrainedDictionary | None = None,
+        coding: int | None = CODING_NONE
+    ) -> None:
+        """
+        Write a binary .pm container, each member as soon as it comes out
+        of `compressed_files`, then the index of the members. Blocks come
+        as `(codes count, payload, checksum)` (see `compress_file_packed`),
+        the file is read again for its checksum when they don't have one.
+
+        With `sources` (see `find_duplicates`) only the first of identical
+        files comes out of `compressed_files`, the others are written as
+        links to it. `dictionary` is the trained dictionary the files were
+        compressed with and `coding` the entropy coding of their codes.
+        """
+        members: list[Member] = list()
+
+        if dictionary is not None:
+            self.container.write_header(output, dictionary.id, len(dictionary))
+        else:
+            self.container.write_header(output)
+
+        start_code = LZWCodeTable.FIRST_CODE + (len(dictionary) if dictionary is not None else 0)
+
+        compressed_files = iter(compressed_files)
 
-        logger.debug(f"Number of compressed file data: {len(compressed_data)}")
+        for i, file_path in enumerate(files_paths):
+            if sources is not None and sources[i] != i:
+                members.append(self.container.write_link(output, file_path, members[sources[i]]))
+                continue
 
-        for i in range(len(compressed_data)):
-            if i == 0:
-                output_data.append(file_structure.data[i])
+            _, blocks = next(compressed_files)
+
+            uncompressed_size = Path(file_path).stat().st_size
+
+            member = self.container.write_packed_member(
+                output,
+                path=file_path,
+                blocks=[(codes_n, payload) for codes_n, payload, _ in blocks],
+                uncompressed_size=uncompressed_size,
+                max_code_width=max_code_width,
+                policy=policy,
+                block_size=block_size,
+                start_code=start_code,
+                source_path=file_path,
+                coding=coding
+            )
+
+            if any(checksum is None for _, _, checksum in blocks):
+                member.checksum = FileHandler(file_path).checksum()
             else:
-                output_data.append("\n\n" + file_structure.data[i])
-            
-            line_length = int(len(compressed_data[i]) // 12)
-            buffer = ["--"]
-            
-            for index, token in enumerate(compressed_data[i]):
-                logger.debug(f"Current token: `{token}`")
-                buffer.append(str(token))
-
-                # Write buffer when hitting line length
-                if len(buffer) == line_length:
-                    output_data.append("\n" + " ".join(buffer))
-                    
-                    buffer = ["--"]  # Reset buffer
-
-            # # Ensure last buffer is added
-            if len(buffer) > 1:
+                # The workers computed the CRC32 of each block as they read it
+                member.checksum = 0
+                for (_, _, checksum), (start, stop) in zip(
+                    blocks, split_data_to_blocks(data_n=uncompressed_size, block_size=block_size)
+                ):
+                    member.checksum = crc32_combine(member.checksum, checksum, stop - start)
+
+            members.append(member)
+
+        self.container.write_end(output)
+        self.container.write_index(output, members)
+
+    def write_text_archive(
+        self,
+        output: BinaryIO,
+        files_paths: list[str],
+        compressed_files: Iterable[tuple[int, list[array]]]
+    ) -> None:
+        """
+        Write a text .pm file, each member as soon as it comes out of
+        `compressed_files`.
+        """
+        output.write(TEXT_HEADER)
+
+        for i, blocks in compressed_files:
+            # No block table in the text format, blocks are joined
+            # with CLEAR codes which reset the decoder the same way.
+            output.write(
+                self.text_member_data(f":: {files_paths[i]}\n", self.join_blocks(blocks), i == 0).encode("utf-8")
+            )
+
+    @METRICS.timed(STAGE_SERIALIZE)
+    def text_member_data(self, header: str, compressed_data: array, first: bool | None = True) -> str:
+        """
+        Convert a member into its text format data.
+        """
+        output_data = []
+
+        if first:
+            output_data.append(header)
+        else:
+            output_data.append("\n\n" + header)
+
+        line_length = int(len(compressed_data) // 12)
+        buffer = ["--"]
+
+        for token in compressed_data:
+            buffer.append(str(token))
+
+            # Write buffer when hitting line length
+            if len(buffer) == line_length:
                 output_data.append("\n" + " ".join(buffer))
-            
-            # Indicate end of this file's compressed data
-            output_data.append(" [EOF]")
+
+                buffer = ["--"]  # Reset buffer
+
+        # Ensure last buffer is added (empty files still need their `--` line)
+        if len(buffer) > 1 or not compressed_data:
+            output_data.append("\n" + " ".join(buffer))
+
+        # Indicate end of this file's compressed data
+        output_data.append(" [EOF]")
 
         return "".join(output_data)
@@ -23,21 +23,22 @@
 __all__ = [
     "Nodes",
     "get_platform",
-    "measure_time",
     "create_path",
     "show_diff",
     "split_data_to_batches",
+    "split_data_to_blocks",
+    "crc32_combine",
     "list_files_in_directory",
     "replace_unsupported_characters"
 ]
 
 import os
-import time
-import wcwidth
+import sys
+import functools
 
 from pathlib import Path
 
-from loguru import logger
+from pmole.log import logger
 
 # Types
 PL_WINDOWS = 0
@@ -47,10 +48,13 @@ PL_LINUX = 1
 class Nodes: ...
 
 def get_platform() -> int: ...
-def measure_time(func: callable) -> None: ...
 def create_path(path: str) -> bool: ...
 def show_diff(d1, d2, file1: str, file2: str) -> str: ...
 def split_data_to_batches(data_n: int, k: int) -> list: ...
+def split_data_to_blocks(data_n: int, block_size: int) -> list[tuple[int, int]]: ...
+def crc32_combine(crc1: int, crc2: int, length2: int) -> int: ...
+def crc32_zeros(length: int) -> tuple[int, ...]: ...
+def gf2_times(matrix: tuple[int, ...] | list[int], vector: int) -> int: ...
 def list_files_in_directory(directory: str) -> list[str]: ...
 def replace_unsupported_characters(input_string: str, placeholder: str = "?") -> str: ...
 
@@ -70,27 +74,7 @@ class Nodes:
         self.data = data
 
 def get_platform() -> int:
-    import platform
-    
-    plattype = platform.system()
-    
-    return PL_WINDOWS if plattype == "Windows" else PL_LINUX
-
-def measure_time(func: callable) -> None:
-    """
-    Mesure the time a function takes.
-    """
-    def wrapper(self, *args, **kwargs):
-        start_time = time.time()
-        result = func(self, *args, **kwargs)
-        end_time = time.time()
-        deff = end_time - start_time
-
-        logger.debug(f"Function '{func.__name__}' took '{deff:.6f}' seconds")
-
-        return result
-    
-    return wrapper
+    return PL_WINDOWS if sys.platform == "win32" else PL_LINUX
 
 def create_path(path: str) -> str:
     """
@@ -150,8 +134,68 @@ def split_data_to_batches(data_n: int, k: int) -> list:
     
     return batches
 
+def split_data_to_blocks(data_n: int, block_size: int) -> list[tuple[int, int]]:
+    """
+    Split data into fixed size blocks, the last one holds the remainder.
+
+    (start, stop) idx
+    """
+    if block_size <= 0 or data_n <= block_size:
+        return [(0, data_n)]
+
+    return [(start, min(start + block_size, data_n)) for start in range(0, data_n, block_size)]
+
+def crc32_combine(crc1: int, crc2: int, length2: int) -> int:
+    """
+    CRC32 of two pieces of data one after the other, from the CRC32 of
+    each and the length of the second one (zlib's `crc32_combine`).
+    """
+    if length2 <= 0:
+        return crc1
+
+    return gf2_times(crc32_zeros(length2), crc1) ^ crc2
+
+@functools.lru_cache(maxsize=16)
+def crc32_zeros(length: int) -> tuple[int, ...]:
+    """
+    Appending `length` zero bytes to some data is a linear operator on
+    its CRC32, a 32x32 bits matrix (a column per int). It is built from
+    the operator of a single zero bit by squaring.
+    """
+    operator = [0xEDB88320] + [1 << i for i in range(31)]  # One zero bit
+    for _ in range(3):
+        operator = [gf2_times(operator, column) for column in operator]
+
+    result = None
+    while length:
+        if length & 1:
+            result = operator if result is None else [gf2_times(operator, column) for column in result]
+
+        length >>= 1
+        if length:
+            operator = [gf2_times(operator, column) for column in operator]
+
+    return tuple(result)
+
+def gf2_times(matrix: tuple[int, ...] | list[int], vector: int) -> int:
+    """
+    Multiply a GF(2) matrix (a column per int) by a vector.
+    """
+    result = 0
+    i = 0
+    while vector:
+        if vector & 1:
+            result ^= matrix[i]
+
+        vector >>= 1
+        i += 1
+
+    return result
+
 def list_files_in_directory(directory: str) -> list[str]:
     return [str(file) for file in Path(directory).rglob('*') if file.is_file()]
 
 def replace_unsupported_characters(input_string: str, placeholder: str = "?") -> str:
+    import wcwidth
+
     return ''.join(char if wcwidth.wcwidth(char) != -1 else placeholder for char in input_string)
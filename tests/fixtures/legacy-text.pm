@@ -0,0 +1,21 @@
+:: data/b.txt
+
+-- 115 101 241 111 114 32 63488 63490 114 10 [EOF]
+
+:: data/a.txt
+
+-- 104 101 108 108 111 32
+-- 116 63488 114 101 32 63488
+-- 63490 63492 63494 101 63496 63498
+-- 63489 63491 32 119 111 114
+-- 108 100 63505 63500 63493 63495
+-- 63497 63499 63507 63502 63504 63519
+-- 63492 63509 63511 63513 63523 63516
+-- 63503 63518 63506 63501 63517 63514
+-- 63507 63525 63512 63535 63533 63530
+-- 63539 63529 63522 63532 63508 63510
+-- 63538 63528 63521 63531 63515 63550
+-- 63542 63537 63527 63545 63553 63549
+-- 63534 63528 63555 63542 63558 63557
+-- 63560 63545 63562 63559 63541 63569
+-- 63544 63515 63562 [EOF]
\ No newline at end of file
@@ -0,0 +1,68 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import os
+
+import pytest
+
+from pmole.lzw import LZW
+from pmole.lzw import LZWCodeTable
+from pmole.lzw import MIN_CODE_WIDTH
+from pmole.huffman import LZWHuffman
+from pmole.container import Container
+from pmole.container import CODING_NONE
+from pmole.container import CODING_HUFFMAN
+
+def test_algo_huffman() -> None:
+    """
+    Test Huffman coding LZW codes
+    """
+    data = b"".join(b"line %d: hello there, hello world\n" % (i % 97) for i in range(3000))
+
+    for max_code_width in (MIN_CODE_WIDTH, 12, 16):
+        codes = LZW().compress(data=data, dictionary=LZWCodeTable(max_code_width=max_code_width))
+
+        huffman = LZWHuffman(max_code_width)
+        payload = huffman.encode(codes)
+
+        assert len(payload) < len(Container().pack_codes(codes, max_code_width))
+        assert huffman.decode(payload, len(codes)) == codes
+
+        with pytest.raises(ValueError):
+            huffman.decode(payload[:len(payload) // 2], len(codes))
+
+    for data in (b"", b"a", b"a" * 5000, os.urandom(5000)):
+        codes = LZW().compress(data=data)
+
+        assert LZWHuffman().decode(LZWHuffman().encode(codes), len(codes)) == codes
+
+def test_algo_huffman_blocks() -> None:
+    """
+    Test that entropy coded blocks fall back to bit-packed codes when they're smaller
+    """
+    container = Container()
+
+    for data, coding in ((b"hello there " * 2000, CODING_HUFFMAN), (b"hi", CODING_NONE)):
+        codes = LZW().compress(data=data)
+        payload = container.pack_block(codes, coding=CODING_HUFFMAN)
+
+        assert payload[0] == coding
+        assert container.unpack_block(payload, len(codes), coding=CODING_HUFFMAN) == codes
@@ -20,7 +20,22 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import mmap
+
+from array import array
+
 from pmole.lzw import LZW
+from pmole.lzw import LZWCodeTable
+from pmole.lzw import LZWCompressor
+from pmole.lzw import LZWDecompressor
+from pmole.lzw import LZWDictionary
+from pmole.lzw import LZWTrainedDictionary
+from pmole.lzw import RESET
+from pmole.lzw import FREEZE
+from pmole.lzw import MIN_CODE_WIDTH
+from pmole.lzw import CODES_TYPECODE
+
+import pytest
 
 def test_algo_lzw() -> None:
     """
@@ -39,4 +54,207 @@ def test_algo_lzw() -> None:
     decompressed_data = lzw.decompress(
         compressed_data=compressed_data
     )
-    assert decompressed_data == text_data.decode()
+    assert decompressed_data == text_data
+
+def test_algo_lzw_binary_data() -> None:
+    """
+    Test the LZW algorithm on bytes outside of the ASCII range
+    """
+    binary_data = bytes(range(256)) * 4 + b"\x00\xff" * 64
+
+    lzw = LZW()
+
+    compressed_data = lzw.compress(
+        data=(binary_data[i:i + 100] for i in range(0, len(binary_data), 100))
+    )
+
+    assert lzw.decompress(compressed_data=compressed_data) == binary_data
+
+def test_algo_lzw_table_policies() -> None:
+    """
+    Test the LZW algorithm once the code table is full
+    """
+    text_data = bytes(range(256)) * 8 + b"hello there 123 world fire [cold] @cold im cold" * 40
+
+    lzw = LZW()
+
+    for policy in (RESET, FREEZE):
+        compressed_data = lzw.compress(
+            data=text_data,
+            dictionary=LZWCodeTable(max_code_width=MIN_CODE_WIDTH, policy=policy)
+        )
+
+        assert max(compressed_data) < 2 ** MIN_CODE_WIDTH
+        assert (LZWCodeTable.CLEAR_CODE in compressed_data) == (policy == RESET)
+
+        decompressed_data = lzw.decompress(
+            compressed_data=compressed_data,
+            dictionary=LZWCodeTable(max_code_width=MIN_CODE_WIDTH, policy=policy)
+        )
+        assert decompressed_data == text_data
+
+def test_algo_lzw_compressor() -> None:
+    """
+    Test the incremental LZW compressor
+    """
+    text_data = b"hello there 123 world fire [cold] @cold im cold" * 20
+
+    compressor = LZWCompressor()
+
+    compressed_data = array(CODES_TYPECODE)
+    for i in range(0, len(text_data), 7):
+        compressed_data += compressor.feed(text_data[i:i + 7])
+    compressed_data += compressor.flush()
+
+    lzw = LZW()
+
+    assert isinstance(lzw.compress(data=text_data), array)
+    assert compressed_data == lzw.compress(data=text_data)
+    assert lzw.decompress(compressed_data=compressed_data) == text_data
+    assert len(compressor.flush()) == 0
+
+def test_algo_lzw_decompressor() -> None:
+    """
+    Test the incremental LZW decompressor
+    """
+    text_data = b"hello there 123 world fire [cold] @cold im cold" * 20
+
+    compressed_data = LZW().compress(
+        data=text_data,
+        dictionary=LZWCodeTable(max_code_width=MIN_CODE_WIDTH)
+    )
+
+    decompressor = LZWDecompressor(dictionary=LZWCodeTable(max_code_width=MIN_CODE_WIDTH))
+
+    decompressed_data = b"".join(
+        decompressor.feed(compressed_data[i:i + 5]) for i in range(0, len(compressed_data), 5)
+    )
+    assert decompressed_data == text_data
+
+def test_algo_lzw_decompressor_window(monkeypatch) -> None:
+    """
+    Test decoding entries that fell out of the decompressor output window
+    """
+    monkeypatch.setattr(LZWDecompressor, "WINDOW", 16)
+
+    data = b"lorem ipsum dolor sit amet, " * 200 + b"a" * 5000 + bytes(range(256)) * 4
+
+    for policy in (RESET, FREEZE):
+        compressor = LZWCompressor(LZWCodeTable(max_code_width=MIN_CODE_WIDTH, policy=policy))
+        codes = compressor.feed(data) + compressor.flush()
+
+        decompressor = LZWDecompressor(LZWCodeTable(max_code_width=MIN_CODE_WIDTH, policy=policy))
+        output = b"".join(decompressor.feed(codes[i:i + 7]) for i in range(0, len(codes), 7))
+
+        assert output == data
+        assert len(decompressor.history) <= 5000
+
+def test_algo_lzw_trained_dictionary(tmp_path) -> None:
+    """
+    Test training, saving and decoding with a trained dictionary
+    """
+    for i in range(20):
+        (tmp_path / f"{i}.json").write_bytes(b'{"id": %d, "status": "active", "tags": ["prod", "eu"]}' % i)
+
+    files_paths = sorted(str(path) for path in tmp_path.iterdir())
+    dictionary = LZWTrainedDictionary.train(files_paths, entries=64)
+
+    assert len(dictionary) == 64
+
+    dictionary.save(str(tmp_path / "json.pmdict"))
+    loaded = LZWTrainedDictionary.load(str(tmp_path / "json.pmdict"))
+
+    assert loaded.id == dictionary.id
+    assert loaded.seed == dictionary.seed
+
+    data = b'{"id": 99, "status": "active", "tags": ["prod", "eu"]}'
+
+    for policy in (RESET, FREEZE):
+        codes = LZW().compress(data=data * 30, dictionary=loaded.table(max_code_width=MIN_CODE_WIDTH, policy=policy))
+        decompressor = LZWDecompressor(loaded.table(max_code_width=MIN_CODE_WIDTH, policy=policy))
+
+        assert decompressor.feed(codes) == data * 30
+
+    # The seeded sequences make the first members smaller
+    assert len(LZW().compress(data=data, dictionary=loaded.table())) < len(LZW().compress(data=data))
+
+    # "aa", "aaa", ... chained past what 9 bits codes can hold
+    with pytest.raises(ValueError):
+        LZWCodeTable(max_code_width=MIN_CODE_WIDTH, seed=[(97 << 8) | 97] + [((257 + i) << 8) | 97 for i in range(300)])
+
+    with pytest.raises(ValueError):
+        LZWCodeTable(seed=[257 << 8])  # Its prefix isn't seeded
+
+def test_algo_lzw_legacy_dictionary() -> None:
+    """
+    Test the LZW algorithm with the legacy unicode dictionary
+    """
+    text_data = b"hello there 123 world fire [cold] @cold im cold"
+
+    dictionary = LZWDictionary()
+    dictionary.create()
+
+    assert dictionary.INIT_DICT_SIZE == 63488
+    assert dictionary.get_value("é".encode("utf-8")) == ord("é")
+    assert dictionary.get_key(ord("é")) == "é".encode("utf-8")
+    assert dictionary.exists(key=b"\xed\xa0\x80") == (False, None)  # Surrogate
+
+    lzw = LZW()
+
+    compressed_data = lzw.compress(data=text_data, dictionary=dictionary)
+
+    assert lzw.decompress(compressed_data=compressed_data, dictionary=LZWDictionary()) == text_data
+
+    # Multi-byte base entries are matched as a whole
+    dictionary = LZWDictionary()
+
+    assert lzw.compress(data="abababé é".encode("utf-8"), dictionary=dictionary) == [
+        97, 98, 63488, 63488, 233, 32, 233
+    ]
+    assert dictionary.get_value(b"aba") == 63490
+    assert dictionary.get_value("é ".encode("utf-8")) == 63492
+
+def test_algo_lzw_base_table_cache(tmp_path, monkeypatch) -> None:
+    """
+    Test the cached base table of the legacy dictionary
+    """
+    cache_path = str(tmp_path / "cache" / "pre_generated_dictionary.bin")
+
+    monkeypatch.setattr(LZWDictionary, "base_table", None)
+
+    assert not LZWDictionary.check_cache_exists(path=cache_path)
+
+    base_table = LZWDictionary.load_base_table(path=cache_path)
+
+    assert LZWDictionary.check_cache_exists(path=cache_path)
+    assert base_table.size == 63488
+    assert base_table.get_key(ord("é")) == "é".encode("utf-8")
+    assert base_table.get_key(0xD800) is None
+
+    # A corrupt cache gets regenerated
+    with open(cache_path, "r+b") as o:
+        o.seek(-1, 2)
+        o.write(b"\x00")
+
+    assert not LZWDictionary.check_cache_exists(path=cache_path)
+
+    # The mapping of a rejected cache is closed
+    buffers = list()
+
+    def mmap_file(*args, **kwargs) -> mmap.mmap:
+        buffers.append(mmap_mmap(*args, **kwargs))
+        return buffers[-1]
+
+    mmap_mmap = mmap.mmap
+    monkeypatch.setattr(mmap, "mmap", mmap_file)
+
+    with pytest.raises(ValueError):
+        LZWDictionary.load_from_temp(path=cache_path)
+
+    assert len(buffers) == 1 and buffers[0].closed
+
+    monkeypatch.setattr(mmap, "mmap", mmap_mmap)
+    monkeypatch.setattr(LZWDictionary, "base_table", None)
+    LZWDictionary.load_base_table(path=cache_path)
+
+    assert LZWDictionary.check_cache_exists(path=cache_path)
@@ -0,0 +1,46 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pmole.bench import Bench
+from pmole.bench import CORPORA
+
+def test_bench_corpora() -> None:
+    """
+    Test that the corpora are sized and reproducible
+    """
+    for corpus in CORPORA:
+        data = Bench.generate(corpus, 5000)
+
+        assert len(data) == 5000
+        assert data == Bench.generate(corpus, 5000)
+
+def test_bench_run() -> None:
+    """
+    Test a small benchmark run
+    """
+    report = Bench().run(corpora=("logs", ), sizes=(4000, ), engines=("lzw", "pmole", "zlib"))
+
+    assert [result["engine"] for result in report["results"]] == ["lzw", "pmole", "zlib"]
+
+    for result in report["results"]:
+        assert result["size"] == 4000
+        assert result["ratio"] > 1
@@ -0,0 +1,85 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import sys
+import json
+import subprocess
+
+from pathlib import Path
+
+import pmole
+
+# `import pmole.cli` may take this many times as long as `import typer`,
+# both are timed in the same process so a slow machine slows both down
+IMPORT_TIME_RATIO: float = 1.0
+
+HEAVY_MODULES: tuple[str] = (
+    "loguru",
+    "bitarray",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "pmole.pmole",
+)
+
+def test_cli_import_time(tmp_path) -> None:
+    """
+    Test that the cli starts fast, without the heavy modules nor side effects
+    """
+    code = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        "import typer\n"
+        "typer_time = time.perf_counter() - start\n"
+        "start = time.perf_counter()\n"
+        "import pmole.cli\n"
+        "print(json.dumps([typer_time, time.perf_counter() - start, list(sys.modules)]))\n"
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(Path(pmole.__file__).parents[1])},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    typer_time, import_time, modules = json.loads(result.stdout)
+
+    assert [module for module in HEAVY_MODULES if module in modules] == []
+    assert not (tmp_path / "pmole.log").exists()
+    assert import_time < typer_time * IMPORT_TIME_RATIO
+
+def test_cli_help(tmp_path) -> None:
+    """
+    Test that printing the help of a command has no side effects
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", "from pmole.cli import run; run()", "compress", "--help"],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(Path(pmole.__file__).parents[1]), "HOME": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    assert "--file-path" in result.stdout
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,184 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+
+import pytest
+
+from pmole.lzw import LZW
+from pmole.lzw import LZWCodeTable
+from pmole.lzw import MIN_CODE_WIDTH
+from pmole.container import Container
+
+def test_container_codes() -> None:
+    """
+    Test packing and unpacking variable width codes
+    """
+    data = b"hello there hello there hello world " * 200
+
+    container = Container()
+    codes = LZW().compress(data=data)
+
+    payload = container.pack_codes(codes)
+
+    assert len(payload) < len(data)
+    assert container.unpack_codes(payload, len(codes)) == codes
+
+    # Small tables go through CLEAR codes, which restart the width schedule
+    codes = LZW().compress(data=data, dictionary=LZWCodeTable(max_code_width=MIN_CODE_WIDTH))
+    payload = container.pack_codes(codes, MIN_CODE_WIDTH)
+
+    assert LZWCodeTable.CLEAR_CODE in codes
+    assert len(payload) == (len(codes) * MIN_CODE_WIDTH + 7) // 8
+    assert container.unpack_codes(payload, len(codes), MIN_CODE_WIDTH) == codes
+
+    # Codes take one more bit once the table reaches a power of two
+    codes = [1] * 256 + [2]
+    payload = container.pack_codes(codes)
+
+    assert payload == int("000000001" * 256 + "0000000010" + "0" * 6, 2).to_bytes(290, "big")
+    assert container.unpack_codes(payload, len(codes)).tolist() == codes
+
+    with pytest.raises(ValueError):
+        container.unpack_codes(payload[:-2], len(codes))
+
+def test_container_members() -> None:
+    """
+    Test writing and reading members
+    """
+    container = Container()
+    output_data = io.BytesIO()
+
+    container.write_header(output_data)
+    container.write_member(output_data, path="a.txt", blocks=[[104, 105]], uncompressed_size=2)
+    container.write_member(output_data, path="empty.txt", blocks=[[]], uncompressed_size=0)
+    container.write_member(output_data, path="b.txt", blocks=[[104, 105], [106]], uncompressed_size=3, block_size=2)
+    container.write_end(output_data)
+
+    output_data.seek(0)
+    members = [
+        (member.path, [code for batch in batches for code in batch])
+        for member, batches in container.read_members(output_data)
+    ]
+
+    assert members == [
+        ("a.txt", [104, 105]),
+        ("empty.txt", []),
+        ("b.txt", [104, 105, LZWCodeTable.CLEAR_CODE, 106]),
+    ]
+
+def test_container_index() -> None:
+    """
+    Test finding members through the index
+    """
+    container = Container()
+    output_data = io.BytesIO()
+
+    container.write_header(output_data)
+    members = [
+        container.write_member(output_data, path="a.txt", blocks=[[104, 105]], uncompressed_size=2),
+        container.write_member(output_data, path="b.txt", blocks=[[104], [106]], uncompressed_size=2, block_size=1),
+    ]
+    for i, member in enumerate(members):
+        member.checksum = i
+    container.write_end(output_data)
+
+    unindexed = output_data.getvalue()
+
+    container.write_index(output_data, members)
+
+    assert [entry.path for entry in container.read_index(output_data)] == ["a.txt", "b.txt"]
+    assert container.read_index(io.BytesIO(unindexed)) is None
+
+    for f, checksum in ((output_data, 1), (io.BytesIO(unindexed), None)):
+        member = container.find_member(f, "b.txt")
+
+        assert member.checksum == checksum
+        assert [code for batch in container.iter_codes(f, member) for code in batch] == [
+            104, LZWCodeTable.CLEAR_CODE, 106
+        ]
+
+    with pytest.raises(KeyError):
+        container.find_member(output_data, "c.txt")
+
+def test_container_links() -> None:
+    """
+    Test members linking to the data of an earlier member
+    """
+    container = Container()
+    output_data = io.BytesIO()
+
+    container.write_header(output_data)
+    member = container.write_member(output_data, path="a.txt", blocks=[[104], [105]], uncompressed_size=2, block_size=1)
+    member.checksum = 7
+    members = [member, container.write_link(output_data, "copy/a.txt", member)]
+    container.write_member(output_data, path="b.txt", blocks=[[106]], uncompressed_size=1)
+    container.write_end(output_data)
+    container.write_index(output_data, members)
+
+    output_data.seek(0)
+    read = [
+        (member.path, member.link, [code for batch in batches for code in batch])
+        for member, batches in container.read_members(output_data)
+    ]
+
+    assert read == [
+        ("a.txt", None, [104, LZWCodeTable.CLEAR_CODE, 105]),
+        ("copy/a.txt", members[0].offset, [104, LZWCodeTable.CLEAR_CODE, 105]),
+        ("b.txt", None, [106]),
+    ]
+    assert [entry.compressed_size for entry in container.read_index(output_data)] == [
+        members[0].payload_size, 0
+    ]
+
+    link = container.find_member(output_data, "copy/a.txt")
+
+    assert link.checksum == 7
+    assert link.checkpoint(1) == members[0].checkpoint(1)
+    assert [code for batch in container.iter_codes(output_data, link) for code in batch] == [
+        104, LZWCodeTable.CLEAR_CODE, 105
+    ]
+
+def test_container_text_members(tmp_path) -> None:
+    """
+    Test parsing the members of a text .pm file
+    """
+    file_path = tmp_path / "data.pm"
+    file_path.write_bytes(
+        b":: data/a.txt\n\n-- 104 105 256\n-- 104 [EOF]\n\n"
+        b":: data/empty.txt\n\n-- [EOF]\n\n"
+        b":: data/b.txt\n\n-- idx 65 257 [EOF]"
+    )
+
+    # Small slices cut the members at separators, never in a code
+    for slice_size in (1 << 17, 8):
+        with open(file_path, "rb") as f:
+            members = [
+                (path, [code for batch in batches for code in batch])
+                for path, batches in Container().read_text_members(f, slice_size)
+            ]
+
+        assert members == [
+            ("data/a.txt", [104, 105, 256, 104]),
+            ("data/empty.txt", []),
+            ("data/b.txt", [65, 257]),
+        ]
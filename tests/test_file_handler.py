@@ -0,0 +1,80 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import io
+
+from pmole.lzw import LZW
+from pmole.file_handler import FileHandler
+from pmole.file_handler import BY_CHUNKS
+from pmole.file_handler import BY_MMAP
+
+def test_file_handler_read(tmp_path) -> None:
+    """
+    Test reading ranges of a file by chunks and mapped
+    """
+    data = bytes(range(256)) * 1000
+    file_path = tmp_path / "data.bin"
+    file_path.write_bytes(data)
+
+    file = FileHandler(str(file_path))
+
+    for start, stop in ((0, None), (1000, 5000), (len(data) - 10, len(data) + 10)):
+        expected = data[start:stop]
+
+        assert b"".join(file.read(threads=3, mode=BY_CHUNKS, start=start, stop=stop)) == expected
+        assert b"".join(bytes(view) for view in file.read(threads=3, mode=BY_MMAP, start=start, stop=stop)) == expected
+
+    assert LZW().compress(file.read(threads=3, mode=BY_MMAP)) == LZW().compress(data)
+
+    empty_path = tmp_path / "empty.bin"
+    empty_path.write_bytes(b"")
+
+    assert list(FileHandler(str(empty_path)).read(threads=3, mode=BY_MMAP)) == []
+
+def test_file_handler_copy_to(tmp_path) -> None:
+    """
+    Test copying ranges of a file to another file and to a buffer
+    """
+    data = bytes(range(256)) * 1000
+    file_path = tmp_path / "data.bin"
+    file_path.write_bytes(data)
+
+    file = FileHandler(str(file_path))
+
+    for start, stop in ((0, None), (1000, 5000), (len(data) - 10, len(data) + 10)):
+        expected = data[start:stop]
+
+        with open(tmp_path / "copy.bin", "wb") as o:
+            o.write(b"head")
+
+            assert file.copy_to(o, start, stop) == len(expected)
+            assert o.tell() == 4 + len(expected)
+
+            o.write(b"tail")
+
+        assert (tmp_path / "copy.bin").read_bytes() == b"head" + expected + b"tail"
+
+        buffer = io.BytesIO()
+
+        assert file.copy_to(buffer, start, stop) == len(expected)
+        assert buffer.getvalue() == expected
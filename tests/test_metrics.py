@@ -0,0 +1,76 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import multiprocessing
+
+import pytest
+
+from pmole.metrics import METRICS
+from pmole.metrics import Metrics
+
+def test_metrics() -> None:
+    """
+    Test recording and merging metrics
+    """
+    metrics = Metrics()
+
+    @metrics.timed("stage")
+    def stage(value: int) -> int:
+        return value * 2
+
+    assert stage(2) == 4
+    with metrics.timer("stage"):
+        pass
+
+    metrics.count("bytes", 10)
+    metrics.observe("sizes", 3)
+    metrics.observe("sizes", 1000)
+
+    worker = Metrics()
+    worker.count("bytes", 5)
+    worker.add_time("stage", 100)
+
+    metrics.merge(worker.snapshot())
+
+    snapshot = metrics.snapshot()
+    assert snapshot["timers"]["stage"]["count"] == 3
+    assert snapshot["counters"] == {"bytes": 15}
+    assert snapshot["histograms"]["sizes"]["buckets"] == {4: 1, 1024: 1}
+
+    report = metrics.report(elapsed=10 ** 9, input_bytes=100, output_bytes=10)
+    assert report["input_bytes_per_second"] == 100
+    assert report["stages"]["stage"]["calls"] == 3
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_metrics_fork() -> None:
+    """
+    Test that a forked child doesn't inherit a held lock
+    """
+    with METRICS.lock:
+        child = multiprocessing.get_context("fork").Process(target=METRICS.reset)
+        child.start()
+
+    child.join(timeout=10)
+    if child.is_alive():
+        child.kill()
+
+    assert child.exitcode == 0
@@ -0,0 +1,483 @@
+# MIT License
+
+# Copyright (c) 2025 ramsy0dev
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import zlib
+import shutil
+
+import pytest
+
+import pmole.pmole
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from pathlib import Path
+
+from pmole.pmole import Pmole
+from pmole.container import Container
+from pmole.container import PM_MAGIC
+from pmole.container import FORMAT_TEXT
+from pmole.container import TEXT_HEADER
+from pmole.container import BLOCK_STORED
+from pmole.container import CODING_NONE
+from pmole.container import CODING_HUFFMAN
+from pmole.lzw import LZWTrainedDictionary
+
+FIXTURES_DIR: Path = Path(__file__).parent / "fixtures"
+
+def test_pmole_directory(tmp_path, monkeypatch) -> None:
+    """
+    Test compressing and decompressing a directory in both formats
+    """
+    monkeypatch.chdir(tmp_path)
+
+    files = {
+        "data/a.txt": b"hello there 123 world fire hello there" * 50,
+        "data/nested/b.bin": bytes(range(256)) * 8,
+        "data/empty.txt": b"",
+    }
+
+    for archive_format in (None, FORMAT_TEXT):
+        for path, data in files.items():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_bytes(data)
+
+        pmole = Pmole()
+        if archive_format is None:
+            pmole.compress(directory_path="data")
+        else:
+            pmole.compress(directory_path="data", archive_format=archive_format)
+
+        shutil.rmtree("data")
+
+        pmole.decompress(file_path="data.pm")
+
+        for path, data in files.items():
+            assert Path(path).read_bytes() == data
+
+def test_pmole_old_archives(tmp_path, monkeypatch) -> None:
+    """
+    Test decompressing archives written by older versions
+    """
+    monkeypatch.chdir(tmp_path)
+
+    files = {
+        "data/a.txt": b"hello there hello there hello world " * 8,
+        "data/b.bin": bytes(range(256)) * 2,
+    }
+
+    for name in ("v4", "v5", "v6", "v7"):
+        for threads in (1, 3):
+            Pmole().decompress(file_path=str(FIXTURES_DIR / f"{name}.pm"), threads=threads)
+
+            for path, data in files.items():
+                assert Path(path).read_bytes() == data
+
+            # These have a duplicate of `a.txt`, stored as a link since v5
+            if name != "v4":
+                assert Path("data/c.txt").read_bytes() == files["data/a.txt"]
+
+            shutil.rmtree("data")
+
+        assert Pmole().read_range(
+            file_path=str(FIXTURES_DIR / f"{name}.pm"), member_path="data/b.bin", offset=300, length=10
+        ) == files["data/b.bin"][300:310]
+
+    # v2 and v3 have other member records, they aren't read
+    for version in (2, 3):
+        Path("old.pm").write_bytes(PM_MAGIC + bytes([version]) + FIXTURES_DIR.joinpath("v4.pm").read_bytes()[6:])
+
+        with pytest.raises(ValueError, match="Unsupported"):
+            Pmole().decompress(file_path="old.pm")
+
+        assert not Path("data").exists()
+
+def test_pmole_legacy_text(tmp_path, monkeypatch) -> None:
+    """
+    Test decompressing a text archive of the first versions, whose codes
+    come from the unicode alphabet
+    """
+    monkeypatch.chdir(tmp_path)
+
+    Pmole().decompress(file_path=str(FIXTURES_DIR / "legacy-text.pm"))
+
+    assert Path("data/a.txt").read_bytes() == b"hello there hello there hello world " * 8
+    assert Path("data/b.txt").read_text(encoding="utf-8") == "señor señor\n"
+
+    # Its codes could come from the byte alphabet too, the missing header decides
+    Path("cafe.pm").write_bytes(b":: data/c.txt\n-- 99 97 102 233 [EOF]")
+    Pmole().decompress(file_path="cafe.pm")
+
+    assert Path("data/c.txt").read_text(encoding="utf-8") == "café"
+
+    Path("data/c.txt").write_bytes(b"caf\xe9")
+    Pmole().compress(file_path="data/c.txt", archive_format=FORMAT_TEXT)
+    assert Path("c.pm").read_bytes().startswith(TEXT_HEADER)
+
+    Path("data/c.txt").unlink()
+    Pmole().decompress(file_path="c.pm")
+
+    assert Path("data/c.txt").read_bytes() == b"caf\xe9"
+
+def test_pmole_threads(tmp_path, monkeypatch) -> None:
+    """
+    Test that the archive doesn't depend on the number of workers
+    """
+    monkeypatch.chdir(tmp_path)
+
+    Path("data").mkdir()
+    for i in range(5):
+        Path(f"data/{i}.txt").write_bytes(b"hello there %d " % i * (i + 1) * 100)
+
+    archives = list()
+    for threads in (1, 3):
+        Pmole().compress(directory_path="data", threads=threads)
+
+        archives.append(Path("data.pm").read_bytes())
+
+    assert archives[0] == archives[1]
+
+    shutil.rmtree("data")
+    Pmole().decompress(file_path="data.pm", threads=3)
+
+    assert Path("data/4.txt").read_bytes() == b"hello there 4 " * 5 * 100
+
+def test_pmole_blocks(tmp_path, monkeypatch) -> None:
+    """
+    Test compressing and decompressing a file split into blocks
+    """
+    monkeypatch.chdir(tmp_path)
+
+    data = b"".join(b"line %d: hello there 123 world fire\n" % i for i in range(2000))
+    Path("big.txt").write_bytes(data)
+
+    for archive_format, threads in ((None, 1), (None, 3), (FORMAT_TEXT, 3)):
+        pmole = Pmole()
+        if archive_format is None:
+            pmole.compress(file_path="big.txt", threads=threads, block_size=10000)
+        else:
+            pmole.compress(file_path="big.txt", threads=threads, block_size=10000, archive_format=archive_format)
+
+        Path("big.txt").unlink()
+
+        pmole.decompress(file_path="big.pm", threads=threads)
+
+        assert Path("big.txt").read_bytes() == data
+
+def test_pmole_decompress_stream(tmp_path, monkeypatch) -> None:
+    """
+    Test that oversized members are streamed by the writer when decompressing in parallel
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pmole.pmole, "STREAM_MEMBER_SIZE", 100)
+
+    files = {
+        "data/small.txt": b"hello",
+        "data/large.txt": b"hello there 123 world fire " * 100,
+    }
+
+    for path, data in files.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(data)
+
+    Pmole().compress(directory_path="data", threads=1)
+
+    shutil.rmtree("data")
+
+    Pmole().decompress(file_path="data.pm", threads=3)
+
+    for path, data in files.items():
+        assert Path(path).read_bytes() == data
+
+def test_pmole_extract(tmp_path, monkeypatch) -> None:
+    """
+    Test extracting single members of an archive
+    """
+    monkeypatch.chdir(tmp_path)
+
+    files = {
+        "data/a.txt": b"hello there 123 world fire hello there" * 50,
+        "data/b.txt": b"".join(b"line %d: hello there\n" % i for i in range(500)),
+    }
+
+    for path, data in files.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(data)
+
+    Pmole().compress(directory_path="data", threads=1, block_size=1000)
+
+    shutil.rmtree("data")
+
+    for threads in (1, 3):
+        Pmole().extract(file_path="data.pm", member_path="data/b.txt", threads=threads)
+
+        assert Path("data/b.txt").read_bytes() == files["data/b.txt"]
+        assert not Path("data/a.txt").exists()
+
+def test_pmole_duplicates(tmp_path, monkeypatch) -> None:
+    """
+    Test that identical files are stored once and restored everywhere
+    """
+    monkeypatch.chdir(tmp_path)
+
+    data = b"".join(b"line %d: hello there\n" % i for i in range(500))
+    files = {
+        "data/a.txt": data,
+        "data/b.txt": data[::-1],
+        "data/vendor/a.txt": data,
+        "data/vendor/c.txt": data,
+        "data/vendor/empty.txt": b"",
+        "data/empty.txt": b"",
+    }
+
+    for path, file_data in files.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(file_data)
+
+    pmole = Pmole()
+
+    # data/a.txt, data/b.txt, data/empty.txt, data/vendor/a.txt, ...
+    assert pmole.find_duplicates(sorted(files), threads=3) == [0, 1, 2, 0, 0, 2]
+
+    pmole.compress(directory_path="data", threads=3, block_size=1000)
+
+    with open("data.pm", "rb") as f:
+        links = [member.link is not None for member, _ in Container().read_members(f)]
+
+    # Only the distinct files have a payload
+    assert links == [False, False, False, True, True, True]
+
+    for threads in (1, 3):
+        shutil.rmtree("data")
+
+        pmole.decompress(file_path="data.pm", threads=threads)
+
+        for path, file_data in files.items():
+            assert Path(path).read_bytes() == file_data
+
+    shutil.rmtree("data")
+
+    pmole.extract(file_path="data.pm", member_path="data/vendor/c.txt")
+
+    assert Path("data/vendor/c.txt").read_bytes() == data
+    assert pmole.read_range(file_path="data.pm", member_path="data/vendor/a.txt", offset=1500, length=20) == data[1500:1520]
+
+def test_pmole_trained_dictionary(tmp_path, monkeypatch) -> None:
+    """
+    Test archives compressed with a trained dictionary
+    """
+    monkeypatch.chdir(tmp_path)
+
+    files = {
+        f"data/{i}.json": b'{"id": %d, "status": "active", "tags": ["prod", "eu"]}' % i for i in range(10)
+    }
+
+    for path, data in files.items():
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_bytes(data)
+
+    LZWTrainedDictionary.train(sorted(files)).save("data.pmdict")
+    LZWTrainedDictionary.train(sorted(files), entries=10).save("other.pmdict")
+
+    pmole = Pmole()
+    pmole.compress(directory_path="data", threads=3, dictionary_path="data.pmdict")
+
+    shutil.rmtree("data")
+
+    # Nothing is decoded without the right dictionary
+    for dictionary_path in (None, "other.pmdict"):
+        with pytest.raises(ValueError):
+            pmole.decompress(file_path="data.pm", dictionary_path=dictionary_path)
+
+        assert not Path("data").exists()
+
+    for threads in (1, 3):
+        pmole.decompress(file_path="data.pm", threads=threads, dictionary_path="data.pmdict")
+
+        for path, data in files.items():
+            assert Path(path).read_bytes() == data
+
+    assert pmole.read_range(
+        file_path="data.pm", member_path="data/3.json", offset=2, length=8, dictionary_path="data.pmdict"
+    ) == files["data/3.json"][2:10]
+
+def test_pmole_read_range(tmp_path, monkeypatch) -> None:
+    """
+    Test reading ranges of members, across checkpoints or not
+    """
+    monkeypatch.chdir(tmp_path)
+
+    data = b"".join(b"line %d: hello there\n" % i for i in range(500))
+    Path("log.txt").write_bytes(data)
+
+    for block_size in (0, 1000):
+        Pmole().compress(file_path="log.txt", threads=1, block_size=block_size)
+
+        for offset, length in ((0, 10), (990, 20), (2500, 3000), (len(data) - 5, 100), (len(data) + 1, 1)):
+            assert Pmole().read_range("log.pm", "log.txt", offset, length) == data[offset:offset + length]
+
+def test_pmole_stored(tmp_path, monkeypatch) -> None:
+    """
+    Test that blocks LZW doesn't make smaller are stored as they are
+    """
+    monkeypatch.chdir(tmp_path)
+
+    Path("data").mkdir()
+
+    files = {
+        "data/random.bin": os.urandom(100000),
+        "data/small.bin": os.urandom(50),
+        "data/mixed.bin": b"hello there " * 5000 + os.urandom(60000),
+    }
+    for file_path, data in files.items():
+        Path(file_path).write_bytes(data)
+
+    for threads in (1, 3):
+        for block_size in (0, 30000):
+            Pmole().compress(directory_path="data", threads=threads, block_size=block_size)
+
+            with open("data.pm", "rb") as f:
+                stored = {
+                    member.path: [codes_n == BLOCK_STORED for codes_n, _ in member.blocks]
+                    for member, _ in Container().read_members(f)
+                }
+
+            assert stored["data/random.bin"] == [True] * len(stored["data/random.bin"])
+            assert stored["data/small.bin"] == [True]
+            assert stored["data/mixed.bin"] == ([False] if block_size == 0 else [False, False, True, True])
+
+            assert Path("data.pm").stat().st_size < sum(len(data) for data in files.values())
+
+            for offset, length in ((0, 10), (59990, 20), (99995, 100)):
+                assert Pmole().read_range(
+                    "data.pm", "data/mixed.bin", offset, length
+                ) == files["data/mixed.bin"][offset:offset + length]
+
+            shutil.rmtree("data")
+
+            Pmole().decompress("data.pm", threads=threads)
+
+            for file_path, data in files.items():
+                assert Path(file_path).read_bytes() == data
+
+def test_pmole_entropy_coding(tmp_path, monkeypatch) -> None:
+    """
+    Test compressing and decompressing with the Huffman entropy coding stage
+    """
+    monkeypatch.chdir(tmp_path)
+
+    Path("data").mkdir()
+
+    files = {
+        "data/log.txt": b"".join(b"2026-10-%02d INFO request id=%d\n" % (i % 28 + 1, i) for i in range(3000)),
+        "data/small.txt": b"hi",
+    }
+    for file_path, data in files.items():
+        Path(file_path).write_bytes(data)
+
+    for threads, block_size in ((1, 0), (3, 20000)):
+        sizes = dict()
+
+        for coding in (CODING_NONE, CODING_HUFFMAN):
+            Pmole().compress(directory_path="data", threads=threads, block_size=block_size, coding=coding)
+
+            with open("data.pm", "rb") as f:
+                assert all(member.coding == coding for member, _ in Container().read_members(f))
+
+            sizes[coding] = Path("data.pm").stat().st_size
+
+        assert sizes[CODING_HUFFMAN] < sizes[CODING_NONE]
+
+        assert Pmole().read_range("data.pm", "data/log.txt", 50000, 30) == files["data/log.txt"][50000:50030]
+
+        shutil.rmtree("data")
+
+        Pmole().decompress("data.pm", threads=threads)
+
+        for file_path, data in files.items():
+            assert Path(file_path).read_bytes() == data
+
+    with pytest.raises(ValueError):
+        Pmole().compress(directory_path="data", archive_format=FORMAT_TEXT, coding=CODING_HUFFMAN)
+
+def test_pmole_compress_stream(tmp_path, monkeypatch) -> None:
+    """
+    Test that members come out in order and that a failed archive isn't left behind
+    """
+    monkeypatch.chdir(tmp_path)
+
+    Path("data").mkdir()
+    for i in range(6):
+        # Decreasing sizes, the first files have the most blocks
+        Path(f"data/{i}.txt").write_bytes(b"hello there %d " % i * (6 - i) * 200)
+
+    files_paths = sorted(str(path) for path in Path("data").iterdir())
+
+    # Blocks are submitted at most `2 * threads` ahead of the ones handed out
+    submitted = list()
+    submit = ProcessPoolExecutor.submit
+
+    def submit_job(self, *args) -> Future:
+        submitted.append(args)
+        return submit(self, *args)
+
+    monkeypatch.setattr(ProcessPoolExecutor, "submit", submit_job)
+
+    compressed_files = Pmole().iter_compressed_files(files_paths, threads=3, block_size=1000, pack=True)
+    _, blocks = next(compressed_files)
+
+    assert len(submitted) == len(blocks) + 3 * 2
+
+    compressed_files.close()
+    monkeypatch.setattr(ProcessPoolExecutor, "submit", submit)
+
+    compressed_files = list(Pmole().iter_compressed_files(files_paths, threads=3, block_size=1000, pack=True))
+
+    assert [i for i, _ in compressed_files] == list(range(6))
+    assert all(isinstance(codes_n, int) and isinstance(payload, bytes) for _, blocks in compressed_files for codes_n, payload, _ in blocks)
+
+    # The workers checksum each block, the archive index gets the whole file's
+    for i, blocks in compressed_files:
+        data = Path(files_paths[i]).read_bytes()
+
+        assert [checksum for _, _, checksum in blocks] == [
+            zlib.crc32(data[start:start + 1000]) for start in range(0, len(data), 1000)
+        ]
+
+    Pmole().compress(directory_path="data", threads=3, block_size=1000)
+
+    with open("data.pm", "rb") as f:
+        assert {entry.path: entry.checksum for entry in Container().read_index(f)} == {
+            file_path: zlib.crc32(Path(file_path).read_bytes()) for file_path in files_paths
+        }
+
+    os.remove("data.pm")
+
+    def compress_file_packed(file_path: str, *args) -> tuple[int, bytes, int]:
+        raise OSError(f"Can't read `{file_path}`.")
+
+    monkeypatch.setattr(Pmole, "compress_file_packed", staticmethod(compress_file_packed))
+
+    with pytest.raises(OSError):
+        Pmole().compress(directory_path="data", threads=1)
+
+    assert not Path("data.pm").exists()